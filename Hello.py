@@ -1,6 +1,4 @@
 import streamlit as st
-import os
-import kaggle
 
 st.set_page_config(page_title="Welcome in my streamlit app", layout="centered")
 st.title("Welcome in my streamlit app")
@@ -17,6 +15,10 @@ with tab1:
         "The purpose of this app is to check the quality of bathing water in the European Union for the years 1990 - 2022."
         "To check details of the point you can use selectbox or map."
     )
+    st.header("Bathing Water Quality Trends for EU")
+    st.markdown(
+        "Share of Excellent, Good, Sufficient and Poor bathing waters by year, compared between countries or zone types."
+    )
 
 with tab2:
     st.header("Temperatura jezior w Polsce")
@@ -27,3 +29,6 @@ with tab2:
     st.markdown("""Aplikacja służy do sprawdzenia jakości wód kąpielowych w Unii Europejskiej dla lat 1990 - 2022.  
     Aby sprawdzić szczegóły punktu, możemy użyć mapy lub selectbox'ów.
     """)
+    st.header("Bathing Water Quality Trends for EU (Trendy jakości wód kąpielowych w UE)")
+    st.markdown("Udział kąpielisk o jakości doskonałej, dobrej, dostatecznej i niedostatecznej w kolejnych latach, "
+                "w podziale na kraje lub typy kąpielisk.")
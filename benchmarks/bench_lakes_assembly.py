@@ -0,0 +1,63 @@
+"""
+Benchmark of lakes dataset assembly: concat + drop_duplicates per daily table (previous implementation)
+against single pass assemble_lakes() for several seasons of synthetic daily tables.
+
+Run from repository root:
+    python -m benchmarks.bench_lakes_assembly --seasons 1 2 4 8
+"""
+import argparse
+import time
+from typing import List
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_daily_tables
+from core import lakes
+
+
+def legacy_assemble(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Previous load_lakes() assembly, kept here as a reference for timings and results"""
+    concat_pdfs = pd.DataFrame(columns=lakes.COLUMNS)
+    for df_pdf in frames:
+        concat_pdfs = pd.concat([concat_pdfs, df_pdf], axis=0)
+        concat_pdfs.drop_duplicates(subset=['Data', 'Nazwa stacji', 'Lokalizacja'], keep='first', inplace=True)
+
+    data = concat_pdfs.replace({"Temperatura wody": "brak danych"}, 0)
+    data = data.astype({
+        "Data": "datetime64[ns]",
+        "Nazwa stacji": "string",
+        "Lokalizacja": "string",
+        "Województwo": "category",
+        "Temperatura wody": "float32"
+    })
+    data['Data'] = data['Data'].apply(lambda x: x.date())
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seasons", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--stations", type=int, default=150)
+    parser.add_argument("--skip-legacy", action="store_true", help="Time only single pass assembly")
+    args = parser.parse_args()
+
+    print(f"{'seasons':>8} {'rows':>10} {'legacy [s]':>12} {'single pass [s]':>16}")
+    for seasons in args.seasons:
+        frames = synthetic_daily_tables(seasons, args.stations)
+
+        start = time.perf_counter()
+        data = lakes.assemble_lakes(frames)
+        single_pass = time.perf_counter() - start
+
+        legacy = float("nan")
+        if not args.skip_legacy:
+            start = time.perf_counter()
+            expected = legacy_assemble(frames)
+            legacy = time.perf_counter() - start
+            pd.testing.assert_frame_equal(data, expected, check_categorical=False)
+
+        print(f"{seasons:>8} {len(data):>10} {legacy:>12.3f} {single_pass:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark of map layer build time and page payload:
+one folium.Marker per bathing water in client-side MarkerCluster (previous implementation)
+against single GeoJSON layer with markers, tooltips and popups templated in browser.
+GeoJSON layer is measured with every point rendered separately (zoom >= CLUSTER_MAX_ZOOM)
+and with server-side clusters at default zoom of the page.
+
+Run from repository root:
+    python -m benchmarks.bench_map_layer --sizes 1000 10000 22000
+    python -m benchmarks.bench_map_layer --dataset    # all points of EU dataset built by ingest.py
+"""
+import argparse
+import time
+from typing import Tuple
+
+import folium
+import pandas as pd
+from folium import plugins
+
+from benchmarks.synthetic import synthetic_bathing_waters
+from core import artifacts, bathing_water, dataset, map_layers
+
+MAP_COLUMNS = ["country", "name", "lon", "lat", "profileUrl", "zoneType", "bathingWaterIdentifier"]
+
+
+def legacy_render(map_data: pd.DataFrame) -> str:
+    """Previous implementation of markers in render_map, kept here as a reference for timings and payload"""
+    m = folium.Map(tiles="OpenStreetMap")
+    marker_cluster = plugins.MarkerCluster().add_to(m)
+    for _, country, name, lon, lat, profileUrl, zone, identifier in map_data[MAP_COLUMNS].itertuples():
+        popup = f"""<b>Name of bathing water:</b>{name}<br>
+                        <b>Country:</b>{country}<br>
+                        <b>Zone type:</b>{zone}<br>
+                        <b>Link to bathing water profile:</b> <a href="{profileUrl}" target="_blank">Link</a>"""
+        folium.Marker(location=[lat, lon], tooltip=bathing_water.marker_tooltip(name, identifier),
+                      popup=popup, lazy=True).add_to(marker_cluster)
+    return m.get_root().render()
+
+
+def geojson_render(map_data: pd.DataFrame, zoom: int) -> str:
+    """Current implementation of markers in render_map, without layer cache"""
+    m = folium.Map(tiles="OpenStreetMap")
+    layer = folium.FeatureGroup(name="Bathing waters").add_to(m)
+    selection_layer = bathing_water.selection_layer(map_data)
+    map_layers.GeoJsonMarkers(selection_layer.view(zoom, None), tooltip=bathing_water.TOOLTIP_TEMPLATE,
+                              popup=bathing_water.POPUP_TEMPLATE).add_to(layer)
+    return m.get_root().render()
+
+
+def measure(render, *args) -> Tuple[float, int]:
+    """Time of building and rendering map and size of its HTML in bytes"""
+    start = time.perf_counter()
+    html = render(*args)
+    return time.perf_counter() - start, len(html.encode("utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 22000])
+    parser.add_argument("--dataset", action="store_true", help="use all points of built EU dataset")
+    args = parser.parse_args()
+
+    if args.dataset:
+        data = dataset.ArrowDataset(artifacts.current_path(bathing_water.ARTIFACT_NAME))
+        samples = [data.query(columns=MAP_COLUMNS)]
+    else:
+        samples = [bathing_water.process_data([synthetic_bathing_waters(size)])[MAP_COLUMNS] for size in args.sizes]
+
+    for map_data in samples:
+        results = {
+            "folium.Marker": measure(legacy_render, map_data),
+            "GeoJSON all points": measure(geojson_render, map_data, map_layers.CLUSTER_MAX_ZOOM),
+            "GeoJSON clustered": measure(geojson_render, map_data, 6)
+        }
+        for name, (seconds, size) in results.items():
+            print(f"points: {len(map_data)}, {name}: {seconds:.3f} s, {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark and regression check of startOfQualityMeasure / monitoringImplementationYear derivation:
+row-wise DataFrame.apply (previous implementation) against column-wise vectorized functions.
+
+Run from repository root:
+    python -m benchmarks.bench_process_data --rows 22000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_bathing_waters
+from core import bathing_water
+
+
+def legacy_find_start_of_quality_measurement(org: pd.Series):
+    """Previous row-wise implementation, kept here as a reference for timings and results"""
+    data = org.copy()
+    mask = data.index.str.startswith("quality")
+    data = data[mask]
+    data = data.reindex([idx.strip() for idx in data.index])
+    data = data[(data.notna()) & (data.str.startswith(("0", "1", "2", "3", "4")))]
+    data = data.dropna(axis=0)
+    index = str(data.first_valid_index())
+    index = index.removeprefix("quality")
+    return index
+
+
+def legacy_find_monitoring_implementation_year(org: pd.Series):
+    """Previous row-wise implementation, kept here as a reference for timings and results"""
+    data = org.copy()
+    mask = data.index.str.startswith("monitoringCalendar")
+    data = data.iloc[mask]
+    data = data[(data.notna()) & (data.str.fullmatch("1 - Implemented"))]
+    data = data.dropna(axis=0)
+    index = str(data.first_valid_index())
+    index = index.removeprefix("monitoringCalendar")
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=22000)
+    args = parser.parse_args()
+
+    data = bathing_water.process_data([synthetic_bathing_waters(args.rows)])
+
+    start = time.perf_counter()
+    start_of_quality = bathing_water.find_start_of_quality_measurement(data)
+    implementation_year = bathing_water.find_monitoring_implementation_year(data)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected_start_of_quality = data.apply(lambda x: legacy_find_start_of_quality_measurement(x), axis=1)
+    expected_implementation_year = data.apply(lambda x: legacy_find_monitoring_implementation_year(x), axis=1)
+    legacy = time.perf_counter() - start
+
+    pd.testing.assert_series_equal(start_of_quality.astype(object), expected_start_of_quality.astype(object),
+                                   check_names=False)
+    pd.testing.assert_series_equal(implementation_year.astype(object), expected_implementation_year.astype(object),
+                                   check_names=False)
+
+    print(f"rows: {args.rows}, row-wise apply: {legacy:.3f} s, vectorized: {vectorized:.3f} s, results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark and regression check of lakes chart queries: boolean masks + sort_values over whole frame
+(previous implementation) against binary search in per-station sorted TimeSeriesStore.
+
+Run from repository root:
+    python -m benchmarks.bench_timeseries --seasons 1 4 8 --queries 200
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_daily_tables
+from core import lakes, timeseries
+
+
+def legacy_range(data: pd.DataFrame, stations: list, start_date, end_date) -> pd.DataFrame:
+    """Previous lakes page filtering, kept here as a reference for timings and results"""
+    selected = data[(data["Nazwa stacji"].isin(stations)) & (data["Data"] >= start_date) & (data["Data"] <= end_date)]
+    return selected.sort_values("Data", kind="mergesort")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seasons", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--stations", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'seasons':>8} {'rows':>10} {'build [s]':>10} {'legacy [ms]':>12} {'store [ms]':>11} {'chart':>6}")
+    for seasons in args.seasons:
+        data = lakes.assemble_lakes(synthetic_daily_tables(seasons, args.stations)).reset_index(drop=True)
+
+        start = time.perf_counter()
+        store = timeseries.TimeSeriesStore(data)
+        build = time.perf_counter() - start
+
+        names = data["Nazwa stacji"].unique()
+        dates = np.sort(data["Data"].unique())
+        queries = []
+        for _ in range(args.queries):
+            stations = list(rng.choice(names, size=3, replace=False))
+            first, last = sorted(rng.choice(dates, size=2, replace=False))
+            queries.append((stations, first, last))
+
+        start = time.perf_counter()
+        expected = [legacy_range(data, *query) for query in queries]
+        legacy = (time.perf_counter() - start) / len(queries) * 1000
+
+        start = time.perf_counter()
+        results = [store.range(*query) for query in queries]
+        frequency, _ = store.chart(*queries[-1])
+        indexed = (time.perf_counter() - start) / len(queries) * 1000
+
+        for result, reference in zip(results, expected):
+            pd.testing.assert_frame_equal(result.sort_values(["Data", "Nazwa stacji"]).reset_index(drop=True),
+                                          reference.sort_values(["Data", "Nazwa stacji"]).reset_index(drop=True))
+
+        print(f"{seasons:>8} {len(data):>10} {build:>10.3f} {legacy:>12.2f} {indexed:>11.2f} {frequency:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Import-time check of page startup: imports every page (and landing page) makes at module top level
+in fresh interpreter with `python -X importtime`, fails if any of them loads dependency that has to stay lazy
+(kaggle authenticates on import, tabula/openpyxl are needed only by ingest.py, plotly.express only by chart)
+or if imports of page take longer than --budget seconds.
+
+tests/test_import_time.py runs the lazy-module check of every page with pytest.
+
+Run from repository root:
+    python -m benchmarks.check_import_time
+    python -m benchmarks.check_import_time --budget 3 --top 15
+"""
+import argparse
+import ast
+import glob
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# streamlit itself imports plotly.io to register its theme, plotly.express is what page defers
+LAZY_MODULES = ["kaggle", "tabula", "jpype", "openpyxl", "plotly.express"]
+
+
+def top_level_imports(filename: str) -> List[str]:
+    """
+    Find modules imported at top level of script
+
+    Parameters:
+        filename (str) : Path of script
+    Returns:
+        modules (List[str]) : Imported modules, "from package import module" is listed as package.module
+    """
+    with open(filename, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module is not None:
+            modules.append(node.module)
+            if node.module == "core":
+                modules.extend(f"core.{alias.name}" for alias in node.names)
+    return modules
+
+
+def import_profile(modules: List[str]) -> Dict[str, Tuple[int, int]]:
+    """
+    Import modules in fresh interpreter with -X importtime
+
+    Parameters:
+        modules (List[str]) : Modules to import
+    Returns:
+        profile (Dict[str, Tuple[int, int]]) : Self and cumulative import time in microseconds by every loaded module
+    """
+    statement = "; ".join(f"import {module}" for module in modules) or "pass"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def page_scripts() -> List[str]:
+    """Paths of landing page and all pages"""
+    return [os.path.join(ROOT, "Hello.py"), *sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))]
+
+
+def lazy_imports(profile: Dict[str, Tuple[int, int]]) -> List[str]:
+    """
+    Find dependencies which have to stay lazy but were loaded
+
+    Parameters:
+        profile (Dict[str, Tuple[int, int]]) : Import profile of page
+    Returns:
+        modules (List[str]) : Loaded modules of LAZY_MODULES
+    """
+    return [lazy_module for lazy_module in LAZY_MODULES
+            if any(module == lazy_module or module.startswith(f"{lazy_module}.") for module in profile)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=5.0, help="maximum import time of single page in seconds")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest top level imports to show")
+    args = parser.parse_args()
+
+    failed = False
+    for page in page_scripts():
+        modules = top_level_imports(page)
+        profile = import_profile(modules)
+        seconds = sum(self_us for self_us, _ in profile.values()) / 1e6
+        lazy = lazy_imports(profile)
+
+        status = "ok"
+        if lazy:
+            status = f"FAIL: imports {', '.join(lazy)}"
+        elif seconds > args.budget:
+            status = f"FAIL: over budget of {args.budget:.1f} s"
+        failed = failed or status != "ok"
+
+        print(f"{os.path.relpath(page, ROOT)}: {seconds:.2f} s, {len(profile)} modules, {status}")
+        slowest = sorted((module for module in profile if module in modules), key=lambda m: -profile[m][1])
+        for module in slowest[:args.top]:
+            print(f"    {profile[module][1] / 1e6:>7.3f} s  {module}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
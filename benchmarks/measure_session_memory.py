@@ -0,0 +1,60 @@
+"""
+Measurement of memory taken by EU bathing water DataFrame in every Streamlit session:
+string schema (previous implementation) against categorical schema from process_data().
+st.cache_data returns pickled copy of cached DataFrame, so pickle size is what every rerun pays for.
+
+Run from repository root:
+    python -m benchmarks.measure_session_memory --rows 22000
+    python -m benchmarks.measure_session_memory --parquet ../lakes_streamlit/data/bathing_water_quality_eu/data_concat.parquet.gzip
+"""
+import argparse
+import pickle
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_bathing_waters
+from core import bathing_water
+
+
+def string_schema(data: pd.DataFrame) -> pd.DataFrame:
+    """Cast categorical columns back to previous schema ("string" dtype, derived years as Python strings)"""
+    return data.astype({
+        column: object if column in ("startOfQualityMeasure", "monitoringImplementationYear") else "string"
+        for column in bathing_water.CATEGORY_COLUMNS
+    })
+
+
+def measure(data: pd.DataFrame) -> dict:
+    """Measure in-memory size, pickle size and pickle round trip time of DataFrame"""
+    start = time.perf_counter()
+    payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle.loads(payload)
+    return {
+        "memory_mb": data.memory_usage(deep=True).sum() / 2 ** 20,
+        "pickle_mb": len(payload) / 2 ** 20,
+        "round_trip_s": time.perf_counter() - start
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=22000, help="Number of synthetic bathing waters")
+    parser.add_argument("--parquet", help="Measure existing parquet file instead of synthetic data")
+    args = parser.parse_args()
+
+    if args.parquet:
+        compact = pd.read_parquet(args.parquet)
+    else:
+        compact = bathing_water.process_data([synthetic_bathing_waters(args.rows)])
+    results = {"string": measure(string_schema(compact)), "categorical": measure(compact)}
+
+    print(f"rows: {len(compact)}")
+    print(f"{'schema':>12} {'memory [MB]':>12} {'pickle [MB]':>12} {'round trip [s]':>15}")
+    for schema, result in results.items():
+        print(f"{schema:>12} {result['memory_mb']:>12.1f} {result['pickle_mb']:>12.1f} {result['round_trip_s']:>15.3f}")
+    print(f"memory reduction per session: {results['string']['memory_mb'] / results['categorical']['memory_mb']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
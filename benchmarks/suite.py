@@ -0,0 +1,202 @@
+"""
+Offline benchmark suite of both datasets on synthetic files, no kaggle account or download needed.
+Generates IMGW-style lattice pdf files and EEA-style .xlsx workbooks for given scale, then times
+ingestion, filtering, point lookup and map building with the same code ingest.py and pages run.
+Timings are compared with stored baselines of the scale, stage slower than its baseline by more than
+--tolerance is reported as regression and the suite exits with status 1.
+
+Run from repository root:
+    python -m benchmarks.suite --scale small
+    python -m benchmarks.suite --scale medium --update-baseline   # store timings of this machine as baseline
+    python -m benchmarks.suite --scale large --output timings.jsonl
+Parsing pdf files needs java (tabula), without it or with --skip-pdf daily tables are written
+directly to parquet shards and the parsing stage is skipped.
+"""
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict
+
+import numpy as np
+
+from benchmarks import synthetic
+from benchmarks.bench_map_layer import MAP_COLUMNS, geojson_render
+from core import bathing_water, dataset, instrumentation, lakes, timeseries
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(__file__), "baselines.json")
+SCALES = {
+    "small": {"stations": 50, "seasons": 1, "days": 30, "bathing_waters": 2000, "workbooks": 2, "queries": 50},
+    "medium": {"stations": 150, "seasons": 2, "days": 153, "bathing_waters": 22000, "workbooks": 4, "queries": 200},
+    "large": {"stations": 300, "seasons": 4, "days": 153, "bathing_waters": 100000, "workbooks": 8, "queries": 500}
+}
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def bench_lakes(work_dir: str, scale: dict, workers: int, parse_pdfs: bool, rng: np.random.Generator) -> None:
+    """Ingest synthetic lakes dataset and query it like the lakes page"""
+    pdf_dir, store_dir = os.path.join(work_dir, "lakes_pdf"), os.path.join(work_dir, "lakes_parquet")
+    if parse_pdfs:
+        synthetic.write_lake_pdfs(pdf_dir, scale["seasons"], scale["stations"], scale["days"])
+        with instrumentation.stage("lakes: parse pdfs"):
+            shards = lakes.update_store(pdf_dir, store_dir, workers)
+    else:
+        shards = {}
+        for table in synthetic.synthetic_daily_tables(scale["seasons"], scale["stations"], days=scale["days"]):
+            date = table["Data"].iloc[0]
+            shards[date] = lakes.shard_path(store_dir, date)
+            os.makedirs(os.path.dirname(shards[date]), exist_ok=True)
+            table.to_parquet(shards[date], index=False)
+
+    snapshot = os.path.join(work_dir, "artifacts", lakes.SNAPSHOT_DIRNAME)
+    with instrumentation.stage("lakes: write snapshot"):
+        lakes.write_snapshot(shards, snapshot)
+
+    with instrumentation.stage("lakes: load series") as record:
+        data = dataset.PartitionedDataset(snapshot)
+        store = timeseries.TimeSeriesStore(data.query(filters={"year": data.seasons}))
+        record["bytes"] = store.nbytes
+
+    stations = np.array(store.unique("Nazwa stacji"), dtype=object)
+    first, last = store.date_bounds(list(stations))
+    days = (last - first).days
+    with instrumentation.stage("lakes: filter"):
+        for _ in range(scale["queries"]):
+            selected = list(rng.choice(stations, size=min(3, len(stations)), replace=False))
+            start, end = sorted(first + datetime.timedelta(days=int(day)) for day in rng.integers(0, days + 1, 2))
+            store.range(selected, start, end)
+            store.chart(selected, start, end)
+
+
+def bench_bathing_water(work_dir: str, scale: dict, workers: int, rng: np.random.Generator) -> None:
+    """Ingest synthetic EU dataset and query it like the bathing water page"""
+    data_dir = os.path.join(work_dir, "bathing_water")
+    files = synthetic.write_bathing_water_workbooks(data_dir, scale["bathing_waters"], scale["workbooks"])
+    parquet_filename = os.path.join(work_dir, "bathing_water.parquet")
+    arrow_filename = os.path.join(work_dir, "artifacts", bathing_water.ARROW_FILENAME)
+    os.makedirs(os.path.dirname(arrow_filename), exist_ok=True)
+    with instrumentation.stage("eu: ingest workbooks"):
+        bathing_water.build_parquet(files, parquet_filename, workers, data_dir=data_dir)
+        bathing_water.write_arrow(parquet_filename, arrow_filename)
+        bathing_water.write_analytics(arrow_filename)
+
+    with instrumentation.stage("eu: load indexes") as record:
+        data = dataset.ArrowDataset(arrow_filename)
+        filter_index = bathing_water.FilterIndex(data.query(columns=["country", "zoneType", "name"]))
+        history = dataset.ArrowDataset(bathing_water.analytics_path(arrow_filename, bathing_water.HISTORY_FILENAME))
+        point_index = bathing_water.PointIndex(
+            data.query(columns=["bathingWaterIdentifier"])["bathingWaterIdentifier"], history.query())
+        trends = dataset.ArrowDataset(bathing_water.analytics_path(arrow_filename, bathing_water.TRENDS_FILENAME))
+        trends = trends.query()
+        record["bytes"] = data.nbytes
+
+    countries = np.array(filter_index.countries(), dtype=object)
+    selections = [list(rng.choice(countries, size=min(3, len(countries)), replace=False))
+                  for _ in range(scale["queries"])]
+    with instrumentation.stage("eu: filter"):
+        for selected in selections:
+            zone_types = filter_index.zone_types(selected)
+            filter_index.names(selected, zone_types)
+            filter_index.rows(selected, zone_types)
+
+    with instrumentation.stage("eu: quality shares"):
+        for selected in selections:
+            bathing_water.quality_shares(trends, selected, by="country")
+
+    identifiers = data.query(columns=["bathingWaterIdentifier"])["bathingWaterIdentifier"].to_numpy()
+    with instrumentation.stage("eu: point lookup"):
+        for identifier in rng.choice(identifiers, size=scale["queries"] * 10):
+            point_index.past_years(point_index.position(identifier))
+
+    with instrumentation.stage("eu: map build") as record:
+        record["bytes"] = sum(len(geojson_render(data.take(filter_index.rows(selected), columns=MAP_COLUMNS), 6))
+                              for selected in selections[:10])
+
+
+def compare(timings: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> Dict[str, str]:
+    """
+    Compare timings with baseline
+
+    Parameters:
+        timings (Dict[str, float]) : Seconds by stage
+        baseline (Dict[str, float]) : Seconds of baseline by stage
+        tolerance (float) : Allowed relative slowdown
+    Returns:
+        statuses (Dict[str, str]) : "ok", "REGRESSION" or "new" by stage
+    """
+    statuses = {}
+    for stage, seconds in timings.items():
+        if stage not in baseline:
+            statuses[stage] = "new"
+        elif seconds > baseline[stage] * (1 + tolerance) and seconds - baseline[stage] > MIN_REGRESSION_SECONDS:
+            statuses[stage] = "REGRESSION"
+        else:
+            statuses[stage] = "ok"
+    return statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    for name, value in SCALES["small"].items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f"override {name} of scale")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of ingestion processes")
+    parser.add_argument("--skip-pdf", action="store_true", help="don't generate and parse pdf files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", help="keep generated files in this directory instead of temporary one")
+    parser.add_argument("--baseline", default=BASELINE_FILENAME, help="JSON file with baselines of scales")
+    parser.add_argument("--update-baseline", action="store_true", help="store timings as baseline of scale")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--output", help="append records of stages to JSON lines file")
+    args = parser.parse_args()
+
+    scale = {name: getattr(args, name) or value for name, value in SCALES[args.scale].items()}
+    parse_pdfs = not args.skip_pdf and shutil.which("java") is not None
+    if not parse_pdfs and not args.skip_pdf:
+        print("java not found, parsing of pdf files is skipped")
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="bwq-bench-")
+    recorder = instrumentation.Recorder("benchmark", args.scale)
+    recorder.start_run()
+    try:
+        rng = np.random.default_rng(args.seed)
+        bench_lakes(work_dir, scale, args.workers, parse_pdfs, rng)
+        bench_bathing_water(work_dir, scale, args.workers, rng)
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        instrumentation.write_jsonl(recorder.records, args.output)
+    timings = {record["stage"]: record["seconds"] for record in recorder.records}
+
+    try:
+        with open(args.baseline, encoding="utf-8") as file:
+            baselines = json.load(file)
+    except FileNotFoundError:
+        baselines = {}
+    baseline = baselines.get(args.scale, {}).get("seconds", {})
+    if baselines.get(args.scale, {}).get("parameters", scale) != scale:
+        print("parameters differ from baseline of scale, timings are not compared")
+        baseline = {}
+    statuses = compare(timings, baseline, args.tolerance)
+
+    print(f"scale: {args.scale} {scale}")
+    print(f"{'stage':<24} {'seconds':>9} {'baseline':>9} {'status':>11}")
+    for stage, seconds in timings.items():
+        print(f"{stage:<24} {seconds:>9.3f} {baseline.get(stage, float('nan')):>9.3f} {statuses[stage]:>11}")
+
+    if args.update_baseline:
+        baselines[args.scale] = {"parameters": scale, "seconds": timings}
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baselines, file, indent=2)
+        print(f"baseline of scale {args.scale} stored in {args.baseline}")
+    elif "REGRESSION" in statuses.values():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Synthetic datasets shaped like the Kaggle datasets used by the app"""
+import datetime
+import os
+from typing import List
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from core import bathing_water
+
+QUALITY_VALUES = ["1 - Excellent", "2 - Good", "3 - Sufficient", "4 - Poor", "0 - Not classified",
+                  "5 - Not classified - changes", "6 - Not classified - new"]
+MONITORING_VALUES = ["1 - Implemented", "2 - Not implemented", "3 - Not applicable"]
+MANAGEMENT_VALUES = ["1 - Open", "2 - Closed temporarily", "3 - Closed permanently", "4 - Not monitored"]
+ZONE_TYPES = list(bathing_water.ZONES_TO_REPLACE)
+COUNTRY_CODES = list(bathing_water.COUNTRIES_TO_REPLACE)
+SEASON_DAYS = 153
+
+# Layout of IMGW daily pdf: header cells (lines of multi-line cell) and column widths in points
+PDF_HEADER = [["Lp."], ["Nazwa stacji"], ["Lokalizacja"], ["Województwo"], ["Temperatura wody", "obserwator", "[°C]"]]
+PDF_COLUMN_WIDTHS = [30, 140, 140, 130, 90]
+PDF_ROW_HEIGHT = 16
+PDF_HEADER_HEIGHT = 40
+PDF_MARGIN = 30
+PDF_FONT_SIZE = 8
+
+
+def synthetic_bathing_waters(rows: int, seed: int = 0, start: int = 0) -> pd.DataFrame:
+    """
+    Generate raw EEA bathing water status sheet (before process_data)
+
+    Parameters:
+        rows (int) : Number of bathing waters
+        seed (int) : Seed of random generator
+        start (int) : Number of first bathing water, so sheets of several workbooks don't share identifiers
+    Returns:
+        data (pd.DataFrame) : DataFrame with the same columns as sheet of EEA .xlsx file
+    """
+    rng = np.random.default_rng(seed)
+    data = {
+        "countryCode": rng.choice(COUNTRY_CODES, rows),
+        "bathingWaterIdentifier": [f"BW{i:08d}" for i in range(start, start + rows)],
+        "groupIdentifier": [None] * rows,
+        "nameText": [f"Bathing water {i % (rows // 2 + 1)}" for i in range(start, start + rows)],
+        "specialisedZoneType": rng.choice(ZONE_TYPES, rows),
+        "geographicalConstraint": rng.random(rows) < 0.1,
+        "lon": rng.uniform(-10, 30, rows),
+        "lat": rng.uniform(35, 65, rows),
+        "bwProfileUrl": [f"https://bwprofile.example.eu/{i}" for i in range(start, start + rows)],
+    }
+
+    first_year = rng.integers(1990, 2024, rows)
+    for year in range(1990, 2023):
+        values = rng.choice(QUALITY_VALUES, rows).astype(object)
+        values[first_year > year] = None
+        data[f"quality{year}"] = values
+
+    implementation_year = rng.integers(2018, 2024, rows)
+    for year in range(2018, 2023):
+        values = rng.choice(MONITORING_VALUES[1:], rows).astype(object)
+        values[implementation_year == year] = MONITORING_VALUES[0]
+        values[rng.random(rows) < 0.05] = None
+        data[f"monitoringCalendar{year}"] = values
+    for year in range(2018, 2023):
+        data[f"management{year}"] = rng.choice(MANAGEMENT_VALUES, rows)
+
+    return pd.DataFrame(data)
+
+
+def write_bathing_water_workbooks(data_dir: str, rows: int, files: int = 1, seed: int = 0) -> List[str]:
+    """
+    Write synthetic EEA .xlsx files, bathing waters are in second sheet as in files of the dataset
+
+    Parameters:
+        data_dir (str) : Output directory
+        rows (int) : Number of bathing waters in all files
+        files (int) : Number of files
+        seed (int) : Seed of random generator
+    Returns:
+        files (List[str]) : Paths of written files
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    filenames = []
+    bounds = np.linspace(0, rows, files + 1).astype(int)
+    for number, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        sheet = synthetic_bathing_waters(int(stop - start), seed + number, int(start))
+        workbook = openpyxl.Workbook(write_only=True)
+        workbook.create_sheet("Readme").append(["Synthetic bathing water status"])
+        worksheet = workbook.create_sheet("BathingWaterStatus")
+        worksheet.append(list(sheet.columns))
+        for row in sheet.astype(object).itertuples(index=False):
+            worksheet.append([None if value is None or value != value else value for value in row])
+        filename = os.path.join(data_dir, f"bathing_water_status_{number:03d}.xlsx")
+        workbook.save(filename)
+        filenames.append(filename)
+    return filenames
+
+
+def synthetic_daily_tables(seasons: int, stations: int, seed: int = 0,
+                           days: int = SEASON_DAYS) -> List[pd.DataFrame]:
+    """
+    Generate daily tables shaped like parsed IMGW pdf files (all values as strings) for May - September seasons
+
+    Parameters:
+        seasons (int) : Number of seasons, starting from 2023
+        stations (int) : Number of stations in every daily table
+        seed (int) : Seed of random generator
+        days (int) : Number of days of every season
+    Returns:
+        frames (List[pd.DataFrame]) : Daily tables in order of dates
+    """
+    rng = np.random.default_rng(seed)
+    names = [f"Stacja {i}" for i in range(stations)]
+    locations = [f"Jezioro {i}" for i in range(stations)]
+    regions = [f"województwo {i % 16}" for i in range(stations)]
+    frames = []
+    for season in range(seasons):
+        start = datetime.date(2023 + season, 5, 1)
+        for day in range(days):
+            temperatures = np.round(rng.uniform(8, 28, stations), 1).astype(str)
+            temperatures[rng.random(stations) < 0.05] = "brak danych"
+            frames.append(pd.DataFrame({
+                "Nazwa stacji": names,
+                "Lokalizacja": locations,
+                "Województwo": regions,
+                "Temperatura wody": temperatures,
+                "Data": str(start + datetime.timedelta(days=day))
+            }))
+    return frames
+
+
+def _pdf_text(value: str) -> bytes:
+    """Encode text as PDF literal string in WinAnsi encoding"""
+    encoded = value.encode("cp1252")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def lattice_pdf(rows: List[List[str]]) -> bytes:
+    """
+    Render table as single page pdf with ruled cells (lattice), laid out like IMGW daily pdf,
+    so tabula reads it in lattice mode with the same header as real files
+
+    Parameters:
+        rows (List[List[str]]) : Rows of table, values of all PDF_HEADER columns
+    Returns:
+        pdf (bytes) : Content of pdf file
+    """
+    width = sum(PDF_COLUMN_WIDTHS) + 2 * PDF_MARGIN
+    height = PDF_HEADER_HEIGHT + PDF_ROW_HEIGHT * len(rows) + 2 * PDF_MARGIN
+    lefts = np.cumsum([PDF_MARGIN] + PDF_COLUMN_WIDTHS).tolist()
+    top = height - PDF_MARGIN
+    tops = [top, top - PDF_HEADER_HEIGHT] + [top - PDF_HEADER_HEIGHT - PDF_ROW_HEIGHT * (i + 1)
+                                             for i in range(len(rows))]
+
+    content = [b"0.5 w"]
+    for y in tops:
+        content.append(f"{lefts[0]} {y} m {lefts[-1]} {y} l S".encode())
+    for x in lefts:
+        content.append(f"{x} {tops[0]} m {x} {tops[-1]} l S".encode())
+
+    content.append(f"BT /F1 {PDF_FONT_SIZE} Tf".encode())
+    cells = [(tops[0], PDF_HEADER_HEIGHT, PDF_HEADER)]
+    cells += [(y, PDF_ROW_HEIGHT, [[value] for value in row]) for y, row in zip(tops[1:], rows)]
+    for y, row_height, row in cells:
+        for x, lines in zip(lefts, row):
+            baseline = y - (row_height - len(lines) * (PDF_FONT_SIZE + 2)) / 2 - PDF_FONT_SIZE
+            for number, line in enumerate(lines):
+                content.append(f"1 0 0 1 {x + 3} {baseline - number * (PDF_FONT_SIZE + 2):.1f} Tm ".encode()
+                               + _pdf_text(line) + b" Tj")
+    content.append(b"ET")
+    stream = b"\n".join(content)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+        f"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>".encode(),
+        f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+def write_lake_pdfs(pdf_dir: str, seasons: int, stations: int, days: int = SEASON_DAYS, seed: int = 0) -> List[str]:
+    """
+    Write synthetic IMGW daily pdf files, one directory per season, date of measurement in filename
+
+    Parameters:
+        pdf_dir (str) : Output directory
+        seasons (int) : Number of seasons, starting from 2023
+        stations (int) : Number of stations in every file
+        days (int) : Number of days of every season
+        seed (int) : Seed of random generator
+    Returns:
+        files (List[str]) : Paths of written files
+    """
+    filenames = []
+    for table in synthetic_daily_tables(seasons, stations, seed, days):
+        date = table["Data"].iloc[0]
+        values = table[["Nazwa stacji", "Lokalizacja", "Województwo", "Temperatura wody"]].itertuples(index=False)
+        rows = [[str(number), *row] for number, row in enumerate(values, start=1)]
+        filename = os.path.join(pdf_dir, date[:4], f"temperatura_wody_{date.replace('-', '')}.pdf")
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "wb") as file:
+            file.write(lattice_pdf(rows))
+        filenames.append(filename)
+    return filenames
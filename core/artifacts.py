@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from os.path import join
+from typing import Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows, ingestion is not locked
+    fcntl = None
+
+ARTIFACT_DIR = os.environ.get("ARTIFACT_DIR", "../lakes_streamlit/data/artifacts")
+CURRENT_FILENAME = "current.json"
+LOCK_FILENAME = "ingest.lock"
+KEEP_VERSIONS = 3
+
+
+def fingerprint(sources) -> str:
+    """
+    Calculate fingerprint of artifact sources
+
+    Parameters:
+        sources : JSON serializable description of sources (file names, sizes, hashes...)
+    Returns:
+        digest (str) : Hex digest of sources
+    """
+    return hashlib.sha256(json.dumps(sources, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def current(name: str, artifact_dir: str = ARTIFACT_DIR) -> Optional[dict]:
+    """
+    Read pointer to current version of artifact
+
+    Parameters:
+        name (str) : Name of artifact
+        artifact_dir (str) : Directory with artifacts
+    Returns:
+        pointer (Optional[dict]) : Version, filename, fingerprint and creation time of current version,
+            None if artifact wasn't built yet
+    """
+    try:
+        with open(join(artifact_dir, name, CURRENT_FILENAME), encoding="utf-8") as file:
+            pointer = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not os.path.exists(artifact_path(name, pointer["version"], pointer["filename"], artifact_dir)):
+        return None
+    return pointer
+
+
+def artifact_path(name: str, version: str, filename: str, artifact_dir: str = ARTIFACT_DIR) -> str:
+    """Path of artifact file in given version"""
+    return join(artifact_dir, name, version, filename)
+
+
+def current_path(name: str, artifact_dir: str = ARTIFACT_DIR) -> str:
+    """
+    Find path of current version of artifact
+
+    Parameters:
+        name (str) : Name of artifact
+        artifact_dir (str) : Directory with artifacts
+    Returns:
+        path (str) : Path of artifact file
+    """
+    pointer = current(name, artifact_dir)
+    if pointer is None:
+        raise FileNotFoundError(f"Artifact '{name}' is not built yet, run `python ingest.py`")
+    return artifact_path(name, pointer["version"], pointer["filename"], artifact_dir)
+
+
+@contextmanager
+def ingest_lock(blocking: bool = True, artifact_dir: str = ARTIFACT_DIR) -> Iterator[bool]:
+    """
+    Hold exclusive lock of artifacts, so ingestion started from cron and background refresh of running app
+    don't build the same artifact at once. Lock is released by OS when process holding it dies.
+
+    Parameters:
+        blocking (bool) : Wait until lock is released by other process
+        artifact_dir (str) : Directory with artifacts
+    Returns:
+        acquired (bool) : False if lock is held by other process and blocking is False
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    with open(join(artifact_dir, LOCK_FILENAME), "a") as file:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def publish(name: str, filename: str, source_fingerprint: str, write: Callable[[str], None],
+            artifact_dir: str = ARTIFACT_DIR) -> str:
+    """
+    Write new version of artifact and switch pointer of current version to it atomically.
+    Nothing is written if current version was built from the same sources. Only KEEP_VERSIONS newest versions
+    are kept, processes which memory-mapped removed version keep reading it until they reopen the artifact.
+
+    Parameters:
+        name (str) : Name of artifact
+        filename (str) : Name of artifact file inside version directory
+        source_fingerprint (str) : Fingerprint of sources of artifact
+        write (Callable[[str], None]) : Function writing artifact to given path
+        artifact_dir (str) : Directory with artifacts
+    Returns:
+        path (str) : Path of current artifact file
+    """
+    pointer = current(name, artifact_dir)
+    if pointer is not None and pointer["fingerprint"] == source_fingerprint:
+        return artifact_path(name, pointer["version"], pointer["filename"], artifact_dir)
+
+    created = datetime.now(timezone.utc)
+    version = created.strftime("%Y%m%dT%H%M%S%fZ")
+    path = artifact_path(name, version, filename, artifact_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write(path)
+
+    pointer = {
+        "version": version,
+        "filename": filename,
+        "fingerprint": source_fingerprint,
+        "created": created.isoformat()
+    }
+    pointer_filename = join(artifact_dir, name, CURRENT_FILENAME)
+    with open(f"{pointer_filename}.tmp", "w", encoding="utf-8") as file:
+        json.dump(pointer, file, indent=2)
+    os.replace(f"{pointer_filename}.tmp", pointer_filename)
+
+    versions = sorted(entry.name for entry in os.scandir(join(artifact_dir, name)) if entry.is_dir())
+    for old_version in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(join(artifact_dir, name, old_version), ignore_errors=True)
+    return path
@@ -0,0 +1,593 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core import map_layers
+from core.artifacts import fingerprint
+from core.dataset import ArrowDataset, write_feather
+
+DATA_DIR = "../lakes_streamlit/data/bathing_water_quality_eu"
+PARQUET_FILENAME = f"{DATA_DIR}/data_concat.parquet.gzip"
+KAGGLE_DATASET = "krzysztofkulasik/status-of-bathing-water-europe-union-2008-2022"
+ARTIFACT_NAME = "bathing_water"
+ARROW_FILENAME = "data_concat.arrow"
+HISTORY_FILENAME = "quality_history.arrow"
+TRENDS_FILENAME = "quality_trends.arrow"
+EXCEL_BATCH_ROWS = 5000
+INGEST_WORKERS = int(os.environ.get("EU_INGEST_WORKERS", os.cpu_count() or 1))
+QUALITY_YEARS = range(1990, 2023)
+MANAGEMENT_YEARS = range(2018, 2023)
+TOOLTIP_SEPARATOR = "\u2063"
+QUALITY_CLASSES = {"1": "Excellent", "2": "Good", "3": "Sufficient", "4": "Poor"}
+
+COUNTRIES_TO_REPLACE = {'BE': 'Belgium', 'EE': 'Estonia', 'NL': 'Netherlands',
+                        'IE': 'Ireland', 'AT': 'Austria', 'LT': 'Lithuania', 'LU': 'Luxembourg',
+                        'MT': 'Malta', 'DK': 'Denmark', 'EL': 'Greece', 'PL': 'Poland',
+                        'IT': 'Italy', 'SE': 'Sweden', 'CZ': 'Czechia', 'FI': 'Finland',
+                        'RO': 'Romania', 'ES': 'Spain', 'HR': 'Croatia', 'SI': 'Slovenia',
+                        'HU': 'Hungary', 'CY': 'Cyprus', 'LV': 'Latvia',
+                        'AL': 'Albania', 'BG': 'Bulgaria', 'CH': 'Switzerland',
+                        'FR': 'France', 'PT': 'Portugal', 'DE': 'Germany', 'SK': 'Slovakia'}
+
+ZONES_TO_REPLACE = {"riverBathingWater": "river",
+                    "coastalBathingWater": "coastal",
+                    "transitionalBathingWater": "transitional",
+                    "lakeBathingWater": "lake"}
+
+COLUMN_TYPES = {
+    "countryCode": "string",
+    "bathingWaterIdentifier": "string",
+    "nameText": "string",
+    "specialisedZoneType": "string",
+    "geographicalConstraint": "bool",
+    "lon": "float32",
+    "lat": "float32",
+    "bwProfileUrl": "string",
+    "quality1990": "string", "quality1991": "string",
+    "quality1992": "string", "quality1993": "string",
+    "quality1994": "string", "quality1995": "string",
+    "quality1996": "string", "quality1997": "string",
+    "quality1998": "string", "quality1999": "string",
+    "quality2000": "string", "quality2001": "string",
+    "quality2002": "string", "quality2003": "string",
+    "quality2004": "string", "quality2005": "string",
+    "quality2006": "string", "quality2007": "string",
+    "quality2008": "string", "quality2009": "string",
+    "quality2010": "string", "quality2011": "string",
+    "quality2012": "string", "quality2013": "string",
+    "quality2014": "string", "quality2015": "string",
+    "quality2016": "string", "quality2017": "string",
+    "quality2018": "string", "quality2019": "string",
+    "quality2020": "string", "quality2021": "string",
+    "quality2022": "string",
+    "monitoringCalendar2018": "string", "monitoringCalendar2019": "string",
+    "monitoringCalendar2020": "string", "monitoringCalendar2021": "string",
+    "monitoringCalendar2022": "string",
+    "management2018": "string", "management2019": "string",
+    "management2020": "string", "management2021": "string",
+    "management2022": "string"
+}
+
+CATEGORY_COLUMNS = ["country", "zoneType", "startOfQualityMeasure", "monitoringImplementationYear",
+                    *(column for column in COLUMN_TYPES if column.startswith(("quality", "monitoringCalendar",
+                                                                              "management")))]
+
+
+def process_data(datasets: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate list of DataFrames and process (drop unnecessary columns, replace values in columns, change type of
+    columns, add new columns etc.) them to single DataFrame.
+    Columns with only a handful of distinct values (country, zone type, yearly statuses) are categorical,
+    so they are stored as small integer codes and written to parquet with dictionary encoding.
+
+    Parameters:
+        datasets (List[pd.DataFrame]) : List of DataFrames to concatenate and process
+
+    Returns:
+        data (pd.DataFrame) : Concatenated and processed DataFrame
+
+    """
+    data = pd.concat(datasets, axis=0).reset_index().drop("index", axis=1)
+    data = data.drop(columns="groupIdentifier")
+    data = data.astype(COLUMN_TYPES)
+    data = data.replace({"countryCode": COUNTRIES_TO_REPLACE,
+                         "specialisedZoneType": ZONES_TO_REPLACE})
+    data = data.rename(columns={
+        "countryCode": "country",
+        "bwProfileUrl": "profileUrl",
+        "nameText": "name",
+        "specialisedZoneType": "zoneType"
+    })
+    data["startOfQualityMeasure"] = find_start_of_quality_measurement(data)
+    data["monitoringImplementationYear"] = find_monitoring_implementation_year(data)
+    data = data.astype({column: "category" for column in CATEGORY_COLUMNS})
+    return data
+
+
+def _first_matching_year(matches: pd.DataFrame, prefix: str) -> pd.Series:
+    """
+    Find first column with matching value for every row
+
+    Parameters:
+        matches (pd.DataFrame) : Boolean DataFrame with year columns named with given prefix
+        prefix (str) : Prefix of year columns
+    Returns:
+        years (pd.Series) : Year of first matching column or "None" if no column matches
+    """
+    values = matches.to_numpy(dtype=bool)
+    if values.shape[1] == 0:
+        return pd.Series("None", index=matches.index, dtype=object)
+    years = np.array([column.removeprefix(prefix) for column in matches.columns], dtype=object)
+    first = np.where(values.any(axis=1), years[values.argmax(axis=1)], "None")
+    return pd.Series(first, index=matches.index, dtype=object)
+
+
+def find_start_of_quality_measurement(data: pd.DataFrame) -> pd.Series:
+    """
+    Find first year of bathing water quality measurement for every row
+
+    Parameters:
+        data (pd.DataFrame) : DataFrame with quality1990..2022 columns
+
+    Returns:
+        years (pd.Series) : First year of bathing water quality measurement, "None" if quality was never measured
+
+    """
+    columns = [column.strip() for column in data.columns if column.startswith("quality")]
+    quality = data.reindex(columns=columns).astype("string")
+    measured = pd.DataFrame({
+        column: quality[column].str.startswith(("0", "1", "2", "3", "4")).fillna(False) for column in columns
+    }, index=data.index, columns=columns)
+    return _first_matching_year(measured, "quality")
+
+
+def find_monitoring_implementation_year(data: pd.DataFrame) -> pd.Series:
+    """
+    Find year of bathing water quality monitoring implementation for every row
+
+    Parameters:
+        data (pd.DataFrame) : DataFrame with monitoringCalendar2018..2022 columns
+
+    Returns:
+        years (pd.Series) : Year of bathing water quality monitoring implementation, "None" if never implemented
+
+    """
+    columns = [column for column in data.columns if column.startswith("monitoringCalendar")]
+    implemented = data[columns].eq("1 - Implemented").fillna(False)
+    return _first_matching_year(implemented, "monitoringCalendar")
+
+
+class FilterIndex:
+    """
+    Hierarchical index country -> zone type -> row positions and names of bathing waters.
+    Built once when dataset is loaded, so cascading selectboxes only touch entries for selected values.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Parameters:
+            data (pd.DataFrame) : DataFrame with country, zoneType and name columns, in order of dataset rows
+        """
+        self.index: Dict[str, Dict[str, Tuple[np.ndarray, List[str]]]] = {}
+        groups = data.groupby(["country", "zoneType"], observed=True, sort=True).indices
+        names = data["name"].to_numpy()
+        for (country, zone_type), rows in groups.items():
+            self.index.setdefault(country, {})[zone_type] = (
+                rows, list(dict.fromkeys(name for name in names[rows] if pd.notna(name)))
+            )
+
+    def countries(self) -> List[str]:
+        """Sorted list of country names"""
+        return sorted(self.index)
+
+    def zone_types(self, countries: List[str]) -> List[str]:
+        """Sorted list of zone types available in given countries"""
+        return sorted({zone_type for country in countries for zone_type in self.index.get(country, {})})
+
+    def names(self, countries: List[str], zone_types: List[str]) -> List[str]:
+        """Sorted list of bathing water names for given countries and zone types"""
+        return sorted({name for _, names in self._entries(countries, zone_types) for name in names})
+
+    def rows(self, countries: List[str], zone_types: List[str] = None) -> np.ndarray:
+        """
+        Find positions of rows for given countries and zone types
+
+        Parameters:
+            countries (List[str]) : List of country names
+            zone_types (List[str]) : List of zone types, all zone types of given countries if None or empty
+        Returns:
+            rows (np.ndarray) : Sorted positions of rows in dataset
+        """
+        entries = [rows for rows, _ in self._entries(countries, zone_types or None)]
+        if not entries:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(entries))
+
+    def _entries(self, countries: List[str], zone_types: List[str] = None) -> List[Tuple[np.ndarray, List[str]]]:
+        """Index entries for given countries and zone types, for all zone types if zone_types is None"""
+        entries = []
+        for country in countries:
+            zones = self.index.get(country, {})
+            for zone_type in (zones if zone_types is None else zone_types):
+                if zone_type in zones:
+                    entries.append(zones[zone_type])
+        return entries
+
+
+def marker_tooltip(name: str, identifier: str) -> str:
+    """
+    Create tooltip of map marker, which shows name of bathing water and carries its identifier in hidden element,
+    so clicked point can be resolved by identifier from last_object_clicked_tooltip returned by st_folium
+
+    Parameters:
+        name (str) : Name of bathing water
+        identifier (str) : Identifier of bathing water
+    Returns:
+        tooltip (str) : HTML of tooltip
+    """
+    return f'{name}<span style="display:none">{TOOLTIP_SEPARATOR}{identifier}</span>'
+
+
+def identifier_from_tooltip(tooltip: Optional[str]) -> Optional[str]:
+    """
+    Extract identifier of bathing water from text of tooltip created by marker_tooltip
+
+    Parameters:
+        tooltip (Optional[str]) : Text of clicked tooltip
+    Returns:
+        identifier (Optional[str]) : Identifier of bathing water, None if tooltip doesn't carry it
+    """
+    if tooltip is None or TOOLTIP_SEPARATOR not in tooltip:
+        return None
+    return tooltip.rpartition(TOOLTIP_SEPARATOR)[2].strip()
+
+
+def marker_popup(name: str, country: str, zone_type: str, profile_url: str) -> str:
+    """
+    Create popup of map marker
+
+    Parameters:
+        name (str) : Name of bathing water
+        country (str) : Country of bathing water
+        zone_type (str) : Zone type of bathing water
+        profile_url (str) : Link to bathing water profile
+    Returns:
+        popup (str) : HTML of popup
+    """
+    return f"""<b>Name of bathing water:</b>{name}<br>
+                <b>Country:</b>{country}<br>
+                <b>Zone type:</b>{zone_type}<br>
+                <b>Link to bathing water profile:</b> <a href="{profile_url}" target="_blank">Link</a>"""
+
+
+# Same tooltip and popup rendered in browser from properties of GeoJSON feature (p)
+TOOLTIP_TEMPLATE = marker_tooltip("${p.name}", "${p.bathingWaterIdentifier}")
+POPUP_TEMPLATE = marker_popup("${p.name}", "${p.country}", "${p.zoneType}", "${p.profileUrl}")
+LAYER_PROPERTIES = ["name", "country", "zoneType", "profileUrl", "bathingWaterIdentifier"]
+
+
+def selection_layer(data: pd.DataFrame) -> map_layers.SelectionLayer:
+    """
+    Serialize selected bathing waters to map layer, tooltips and popups are templated in browser
+
+    Parameters:
+        data (pd.DataFrame) : Selected bathing waters with columns lat, lon and LAYER_PROPERTIES
+    Returns:
+        layer (map_layers.SelectionLayer) : Layer of selection
+    """
+    properties = data[LAYER_PROPERTIES].astype(object).where(data[LAYER_PROPERTIES].notna(), "")
+    return map_layers.SelectionLayer(data["lat"].to_numpy(), data["lon"].to_numpy(), properties)
+
+
+def quality_history(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reshape yearly quality* and management* columns to long format, one row per point and year
+    since start of quality measurement, management status only since monitoring implementation year
+
+    Parameters:
+        data (pd.DataFrame) : DataFrame with startOfQualityMeasure, monitoringImplementationYear,
+            quality* and management* columns, in order of dataset rows
+    Returns:
+        history (pd.DataFrame) : DataFrame with point (position of row in dataset), year, waterQuality
+            and monitoringStatus columns, sorted by point, latest year first
+    """
+    years = np.array(QUALITY_YEARS[::-1])
+    start_year = pd.to_numeric(data["startOfQualityMeasure"].astype("string"),
+                               errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    implementation_year = pd.to_numeric(data["monitoringImplementationYear"].astype("string"),
+                                        errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    quality = np.column_stack([data[f"quality{year}"].astype(object).to_numpy() for year in years])
+    management = np.column_stack([
+        data[f"management{year}"].astype(object).to_numpy() if year in MANAGEMENT_YEARS
+        else np.full(len(data), None, dtype=object)
+        for year in years
+    ])
+
+    measured = years[np.newaxis, :] >= start_year[:, np.newaxis]
+    monitored = years[np.newaxis, :] >= implementation_year[:, np.newaxis]
+    points, year_positions = np.nonzero(measured)
+    management = np.where(monitored, management, None)
+
+    return pd.DataFrame({
+        "point": points.astype(np.int32),
+        "year": years[year_positions].astype(np.int16),
+        "waterQuality": pd.Series(quality[points, year_positions]).fillna("None").astype("category"),
+        "monitoringStatus": pd.Series(management[points, year_positions]).fillna("None").astype("category")
+    })
+
+
+class PointIndex:
+    """
+    Index of bathing waters by identifier together with long-format table of their yearly water quality
+    and monitoring status (one row per point and year, latest year first).
+    Built once when dataset is loaded, so clicked point and its history are found without scanning dataset.
+    """
+
+    def __init__(self, identifiers: pd.Series, history: pd.DataFrame):
+        """
+        Parameters:
+            identifiers (pd.Series) : bathingWaterIdentifier column, in order of dataset rows
+            history (pd.DataFrame) : Long-format history of points built by quality_history
+        """
+        self.positions: Dict[str, int] = {}
+        for position, identifier in enumerate(identifiers.to_numpy()):
+            if pd.notna(identifier):
+                self.positions.setdefault(identifier, position)
+
+        self.years = history[["year", "waterQuality", "monitoringStatus"]].reset_index(drop=True)
+        self.offsets = np.searchsorted(history["point"].to_numpy(), np.arange(len(identifiers) + 1))
+
+    def position(self, identifier: Optional[str]) -> Optional[int]:
+        """Position of row with given identifier in dataset, None if identifier is unknown"""
+        return self.positions.get(identifier)
+
+    def past_years(self, position: int) -> pd.DataFrame:
+        """
+        Find water quality and management status for all years since start of quality measurement
+
+        Parameters:
+            position (int) : Position of point in dataset
+        Returns:
+            result (pd.DataFrame) : DataFrame with year, waterQuality and monitoringStatus columns, latest year first
+        """
+        return self.years.iloc[self.offsets[position]:self.offsets[position + 1]].reset_index(drop=True)
+
+
+def quality_class(water_quality: pd.Series) -> pd.Series:
+    """
+    Map water quality statuses ("1 - Excellent", ...) to QUALITY_CLASSES, other statuses to "Not classified"
+
+    Parameters:
+        water_quality (pd.Series) : Categorical water quality statuses
+    Returns:
+        classes (pd.Series) : Categorical classes ordered as QUALITY_CLASSES
+    """
+    labels = {category: QUALITY_CLASSES.get(str(category)[:1], "Not classified")
+              for category in water_quality.cat.categories}
+    return water_quality.map(labels).astype(
+        pd.CategoricalDtype([*QUALITY_CLASSES.values(), "Not classified"], ordered=True))
+
+
+def quality_trends(data: pd.DataFrame, history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count points of every quality class by country, zone type and year, years without assessment are skipped
+
+    Parameters:
+        data (pd.DataFrame) : DataFrame with country and zoneType columns, in order of dataset rows
+        history (pd.DataFrame) : Long-format history of points built by quality_history
+    Returns:
+        trends (pd.DataFrame) : DataFrame with country, zoneType, year, quality and count columns
+    """
+    assessed = history[history["waterQuality"] != "None"]
+    points = assessed["point"].to_numpy()
+    classified = pd.DataFrame({
+        "country": data["country"].iloc[points].to_numpy(),
+        "zoneType": data["zoneType"].iloc[points].to_numpy(),
+        "year": assessed["year"].to_numpy(),
+        "quality": quality_class(assessed["waterQuality"]).array
+    })
+    trends = classified.groupby(["country", "zoneType", "year", "quality"], observed=True).size()
+    return trends.rename("count").reset_index().astype({"country": "category", "zoneType": "category"})
+
+
+def quality_shares(trends: pd.DataFrame, countries: List[str] = None, zone_types: List[str] = None,
+                   by: str = None) -> pd.DataFrame:
+    """
+    Calculate share of every quality class in every year for selected countries and zone types
+
+    Parameters:
+        trends (pd.DataFrame) : Counts of points built by quality_trends
+        countries (List[str]) : Selected countries, all if None or empty
+        zone_types (List[str]) : Selected zone types, all if None or empty
+        by (str) : Column (country or zoneType) to calculate shares separately for its every value,
+            shares of whole selection if None
+    Returns:
+        shares (pd.DataFrame) : DataFrame with [by], year, quality, count and share columns
+    """
+    if countries:
+        trends = trends[trends["country"].isin(countries)]
+    if zone_types:
+        trends = trends[trends["zoneType"].isin(zone_types)]
+    keys = [by, "year"] if by else ["year"]
+    shares = trends.groupby([*keys, "quality"], observed=True)["count"].sum().reset_index()
+    shares["share"] = shares["count"] / shares.groupby(keys, observed=True)["count"].transform("sum")
+    return shares
+
+
+def find_workbooks(data_dir: str = DATA_DIR) -> List[str]:
+    """
+    Find .xlsx files of dataset, sorted so fingerprint and order of rows don't depend on order of os.walk
+
+    Parameters:
+        data_dir (str) : Directory with dataset
+    Returns:
+        files (List[str]) : Sorted paths of .xlsx files
+    """
+    files = []
+    for dirname, _, filenames in os.walk(data_dir):
+        for file in filenames:
+            if file.endswith(".xlsx"):
+                files.append(os.path.join(dirname, file))
+    return sorted(files)
+
+
+def iter_sheet_batches(filename: str, batch_rows: int = EXCEL_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream second sheet of .xlsx file in batches of rows, using openpyxl read-only mode
+
+    Parameters:
+        filename (str) : Path of .xlsx file
+        batch_rows (int) : Number of rows in single batch
+    Returns:
+        batches (Iterator[pd.DataFrame]) : Batches of rows with header of the sheet as columns
+    """
+    # Only ingestion reads workbooks, pages don't load openpyxl
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[1].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) == batch_rows:
+                yield pd.DataFrame(batch, columns=header).fillna(np.nan)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header).fillna(np.nan)
+    finally:
+        workbook.close()
+
+
+def _ingest_workbook(job: Tuple[str, str, int]) -> Tuple[str, int, float]:
+    """Process single .xlsx file batch by batch and write batches to parquet part file"""
+    filename, part_filename, batch_rows = job
+    start = time.perf_counter()
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_sheet_batches(filename, batch_rows):
+            table = pa.Table.from_pandas(process_data([batch]), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(f"{part_filename}.tmp", table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        os.replace(f"{part_filename}.tmp", part_filename)
+    return filename, rows, time.perf_counter() - start
+
+
+def build_parquet(files: List[str], parquet_filename: str = PARQUET_FILENAME, workers: int = INGEST_WORKERS,
+                  batch_rows: int = EXCEL_BATCH_ROWS, data_dir: str = DATA_DIR) -> None:
+    """
+    Process .xlsx files in parallel worker processes and write them to single parquet file.
+    Every worker streams its file in batches to separate part file, then parts are copied row group by row group
+    to the output, so only single batch of rows is held in memory by every process.
+    Part files are kept between builds, only files which are new or changed since their part was written
+    are processed again. Fails if files have no rows, so previous output is never published as new version.
+
+    Parameters:
+        files (List[str]) : Paths of .xlsx files, rows in output are in the same order
+        parquet_filename (str) : Path of output parquet file
+        workers (int) : Number of worker processes, files are processed in current process if 1
+        batch_rows (int) : Number of rows processed at once
+        data_dir (str) : Directory with dataset, part files are named by path of .xlsx file relative to it
+    """
+    parts_dir = f"{parquet_filename}.parts"
+    os.makedirs(parts_dir, exist_ok=True)
+    # workbooks with the same name in different subdirectories get separate parts
+    parts = [os.path.join(parts_dir, f"{quote(os.path.relpath(file, data_dir), safe='')}.parquet") for file in files]
+    for entry in os.scandir(parts_dir):
+        if entry.path not in parts:
+            os.remove(entry.path)
+
+    jobs = [(file, part_filename, batch_rows) for file, part_filename in zip(files, parts)
+            if not os.path.exists(part_filename) or os.path.getmtime(part_filename) < os.path.getmtime(file)]
+    if workers <= 1 or len(jobs) <= 1:
+        list(map(_ingest_workbook, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            list(pool.map(_ingest_workbook, jobs))
+
+    writer = None
+    try:
+        for part_filename in parts:
+            if not os.path.exists(part_filename):
+                continue
+            part = pq.ParquetFile(part_filename)
+            for i in range(part.num_row_groups):
+                table = part.read_row_group(i)
+                if writer is None:
+                    writer = pq.ParquetWriter(f"{parquet_filename}.tmp", table.schema, compression="gzip")
+                writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No rows found in {len(files)} .xlsx files, {parquet_filename} is not written")
+    os.replace(f"{parquet_filename}.tmp", parquet_filename)
+
+
+def workbooks_fingerprint(files: List[str]) -> str:
+    """
+    Calculate fingerprint of .xlsx files from their names, sizes and modification times
+
+    Parameters:
+        files (List[str]) : Paths of .xlsx files
+    Returns:
+        digest (str) : Fingerprint of files
+    """
+    return fingerprint([[ARROW_FILENAME, HISTORY_FILENAME, TRENDS_FILENAME],
+                        [(os.path.basename(file), os.path.getsize(file), os.path.getmtime(file)) for file in files]])
+
+
+def write_arrow(parquet_filename: str, arrow_filename: str) -> None:
+    """
+    Write parquet file with processed dataset to uncompressed Arrow file for memory-mapping
+
+    Parameters:
+        parquet_filename (str) : Path of parquet file with processed dataset
+        arrow_filename (str) : Path of Arrow file
+    """
+    write_feather(pq.read_table(parquet_filename).unify_dictionaries(), arrow_filename)
+
+
+def analytics_path(arrow_filename: str, filename: str) -> str:
+    """Path of precomputed table (HISTORY_FILENAME, TRENDS_FILENAME) stored next to Arrow file of dataset"""
+    return os.path.join(os.path.dirname(arrow_filename), filename)
+
+
+def write_analytics(arrow_filename: str) -> None:
+    """
+    Precompute long-format quality history of points and counts of quality classes by country, zone type and year,
+    and write them next to Arrow file of dataset, so pages don't reshape yearly columns
+
+    Parameters:
+        arrow_filename (str) : Path of Arrow file with processed dataset
+    """
+    data = ArrowDataset(arrow_filename)
+    history = quality_history(data.query(columns=[
+        column for column in data.columns
+        if column in ("startOfQualityMeasure", "monitoringImplementationYear")
+        or column.startswith(("quality", "management"))
+    ]))
+    write_feather(history, analytics_path(arrow_filename, HISTORY_FILENAME))
+    write_feather(quality_trends(data.query(columns=["country", "zoneType"]), history),
+                  analytics_path(arrow_filename, TRENDS_FILENAME))
@@ -0,0 +1,179 @@
+import os
+from typing import Dict, List, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+PARTITIONING = ds.partitioning(pa.schema([("year", pa.int16()), ("month", pa.int8())]), flavor="hive")
+
+
+def write_feather(data: Union[pd.DataFrame, pa.Table], filename: str) -> None:
+    """
+    Write uncompressed Arrow IPC (Feather v2) file, which can be memory-mapped without copying.
+    File is replaced atomically, sessions which already mapped previous file keep reading it.
+
+    Parameters:
+        data (Union[pd.DataFrame, pa.Table]) : Data to write
+        filename (str) : Path of output file
+    """
+    feather.write_feather(data, f"{filename}.tmp", compression="uncompressed")
+    os.replace(f"{filename}.tmp", filename)
+
+
+def partition_path(path: str, year: int, month: int) -> str:
+    """Path of Hive-style partition directory for given month"""
+    return os.path.join(path, f"year={year}", f"month={month}")
+
+
+def write_partition(table: pa.Table, path: str, year: int, month: int) -> None:
+    """
+    Write table with rows of single month to its partition of Hive-style (year=/month=) parquet dataset
+
+    Parameters:
+        table (pa.Table) : Rows of the month, without partition columns
+        path (str) : Root directory of dataset
+        year (int) : Year of rows
+        month (int) : Month of rows
+    """
+    directory = partition_path(path, year, month)
+    os.makedirs(directory, exist_ok=True)
+    pq.write_table(table, os.path.join(directory, "part-0.parquet"))
+
+
+class ArrowDataset:
+    """
+    Read-only dataset backed by memory-mapped Arrow file.
+    Opened once per process (st.cache_resource), so all sessions share single physical copy of data
+    and only filtered rows are converted to pandas.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.table = feather.read_table(filename, memory_map=True)
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    @property
+    def columns(self) -> List[str]:
+        return self.table.column_names
+
+    def mask(self, filters: Dict[str, Sequence] = None) -> pa.ChunkedArray:
+        """
+        Build boolean mask of rows matching all filters
+
+        Parameters:
+            filters (Dict[str, Sequence]) : Allowed values by column name
+        Returns:
+            mask (pa.ChunkedArray) : Boolean mask of rows, None if there is nothing to filter
+        """
+        conditions = [
+            pc.is_in(self.table.column(column), value_set=pa.array(list(values),
+                                                                   type=self._value_type(column)))
+            for column, values in (filters or {}).items()
+        ]
+        if not conditions:
+            return None
+        mask = conditions[0]
+        for condition in conditions[1:]:
+            mask = pc.and_(mask, condition)
+        return mask
+
+    def query(self, filters: Dict[str, Sequence] = None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Select rows matching all filters and convert them to pandas
+
+        Parameters:
+            filters (Dict[str, Sequence]) : Allowed values by column name
+            columns (List[str]) : Columns to select, all if None
+        Returns:
+            data (pd.DataFrame) : Selected rows
+        """
+        table = self.table
+        mask = self.mask(filters)
+        if mask is not None:
+            table = table.filter(mask)
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas()
+
+    def take(self, rows: Sequence[int], columns: List[str] = None) -> pd.DataFrame:
+        """
+        Select rows by their positions and convert them to pandas
+
+        Parameters:
+            rows (Sequence[int]) : Positions of rows
+            columns (List[str]) : Columns to select, all if None
+        Returns:
+            data (pd.DataFrame) : Selected rows
+        """
+        table = self.table if columns is None else self.table.select(columns)
+        return table.take(pa.array(rows, type=pa.int64())).to_pandas()
+
+    def _value_type(self, column: str) -> pa.DataType:
+        """Type of values of column, dictionary columns are compared by their values"""
+        value_type = self.table.schema.field(column).type
+        if pa.types.is_dictionary(value_type):
+            return value_type.value_type
+        return value_type
+
+
+class PartitionedDataset:
+    """
+    Read-only Hive-style (year=/month=) parquet dataset.
+    Filters of partition columns are pushed down, so query of selected seasons reads only files of their months.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+        self.partitions = sorted(
+            (keys["year"], keys["month"])
+            for keys in map(ds.get_partition_keys, (fragment.partition_expression
+                                                    for fragment in self.dataset.get_fragments()))
+        )
+
+    @property
+    def columns(self) -> List[str]:
+        return [name for name in self.dataset.schema.names if name not in PARTITIONING.schema.names]
+
+    @property
+    def seasons(self) -> List[int]:
+        """Years with at least one partition"""
+        return sorted({year for year, _ in self.partitions})
+
+    def expression(self, filters: Dict[str, Sequence] = None) -> ds.Expression:
+        """
+        Build filter expression of rows matching all filters, filters of partition columns (year, month)
+        skip files of other partitions
+
+        Parameters:
+            filters (Dict[str, Sequence]) : Allowed values by column name
+        Returns:
+            expression (ds.Expression) : Filter expression, None if there is nothing to filter
+        """
+        conditions = [ds.field(column).isin(list(values)) for column, values in (filters or {}).items()]
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def query(self, filters: Dict[str, Sequence] = None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Read rows matching all filters and convert them to pandas
+
+        Parameters:
+            filters (Dict[str, Sequence]) : Allowed values by column name
+            columns (List[str]) : Columns to select, all except partition columns if None
+        Returns:
+            data (pd.DataFrame) : Selected rows
+        """
+        table = self.dataset.to_table(columns=columns or self.columns, filter=self.expression(filters))
+        return table.to_pandas()
@@ -0,0 +1,74 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core import instrumentation, refresh
+
+DEBUG_PANEL = os.environ.get("DEBUG_PANEL", "") not in ("", "0")
+
+
+def start(page: str) -> instrumentation.Recorder:
+    """
+    Start recording stages of current rerun in recorder of session, call it at the top of page
+
+    Parameters:
+        page (str) : Name of page
+    Returns:
+        recorder (instrumentation.Recorder) : Recorder of session
+    """
+    key = f"instrumentation_{page}"
+    if key not in st.session_state:
+        ctx = get_script_run_ctx()
+        st.session_state[key] = instrumentation.Recorder(ctx.session_id if ctx is not None else "", page)
+    recorder = st.session_state[key]
+    recorder.start_run()
+    return recorder
+
+
+def enabled() -> bool:
+    """Panel is shown when DEBUG_PANEL environment variable is set or page is opened with ?debug=1"""
+    return DEBUG_PANEL or st.experimental_get_query_params().get("debug") == ["1"]
+
+
+def sidebar(recorder: instrumentation.Recorder) -> None:
+    """
+    Show timings of stages of current rerun in sidebar with download of all records of session as JSON lines
+    and status of background refresh, call it at the end of page
+
+    Parameters:
+        recorder (instrumentation.Recorder) : Recorder of session
+    """
+    if not enabled():
+        return
+    with st.sidebar:
+        st.subheader(f"Timings (run {recorder.run})")
+        st.dataframe(recorder.last_run(), hide_index=True, use_container_width=True,
+                     column_config={"seconds": st.column_config.NumberColumn(format="%.4f")})
+        st.download_button("Export JSON lines", recorder.to_jsonl(), file_name=f"timings_{recorder.page}.jsonl",
+                           mime="application/jsonl")
+        refresher = refresh.current()
+        if refresher is not None:
+            st.subheader("Background refresh")
+            st.json({"running": refresher.is_alive(), "interval": refresher.interval, **refresher.status,
+                     "paths": refresher.paths}, expanded=False)
+
+
+@contextmanager
+def recording(page: str) -> Iterator[instrumentation.Recorder]:
+    """
+    Record whole rerun of page as "rerun" stage and show sidebar at its end, also when page calls st.stop()
+
+    Parameters:
+        page (str) : Name of page
+    Returns:
+        recorder (instrumentation.Recorder) : Recorder of session
+    """
+    recorder = start(page)
+    try:
+        with recorder.stage("rerun"):
+            yield recorder
+    finally:
+        sidebar(recorder)
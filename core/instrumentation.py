@@ -0,0 +1,190 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+HISTORY_SIZE = int(os.environ.get("INSTRUMENTATION_HISTORY_SIZE", 500))
+LOG_FILENAME = os.environ.get("INSTRUMENTATION_LOG")
+
+_recorder = contextvars.ContextVar("recorder", default=None)
+_log_lock = threading.Lock()
+
+
+def payload_size(value) -> Optional[int]:
+    """
+    Estimate size of value returned by stage
+
+    Parameters:
+        value : Result of stage
+    Returns:
+        size (Optional[int]) : Size in bytes, None if it can't be estimated cheaply
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=False).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (dict, list)):
+        return len(json.dumps(value, default=str))
+    nbytes = getattr(value, "nbytes", None)
+    return int(nbytes) if isinstance(nbytes, (int, float)) else None
+
+
+class Recorder:
+    """
+    Timings of stages of reruns of single session, only HISTORY_SIZE newest records are kept.
+    Every record holds wall time, cache hit/miss of cached stages and size of returned payload.
+    """
+
+    def __init__(self, session: str, page: str, history_size: int = HISTORY_SIZE):
+        """
+        Parameters:
+            session (str) : Identifier of session
+            page (str) : Name of page
+            history_size (int) : Number of kept records
+        """
+        self.session = session
+        self.page = page
+        self.run = 0
+        self.records = deque(maxlen=history_size)
+        self._open: List[dict] = []
+
+    def start_run(self) -> None:
+        """Start new rerun of page and make recorder current for stages of this thread"""
+        self.run += 1
+        self._open = []
+        _recorder.set(self)
+
+    @contextmanager
+    def stage(self, name: str, cached: bool = False) -> Iterator[dict]:
+        """
+        Record wall time of block, nested stages are recorded separately and included in time of outer one
+
+        Parameters:
+            name (str) : Name of stage
+            cached (bool) : Stage is cached, it is recorded as hit unless cache_miss() is called inside
+        Returns:
+            record (dict) : Record of stage, "bytes" can be set inside block
+        """
+        record = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "session": self.session,
+            "page": self.page,
+            "run": self.run,
+            "stage": name,
+            "depth": len(self._open),
+            "cache": "hit" if cached else None,
+            "bytes": None
+        }
+        self._open.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self._open.remove(record)
+            self.records.append(record)
+            if LOG_FILENAME:
+                write_jsonl([record], LOG_FILENAME)
+
+    def cache_miss(self) -> None:
+        """Mark innermost cached stage as cache miss"""
+        for record in reversed(self._open):
+            if record["cache"] is not None:
+                record["cache"] = "miss"
+                return
+
+    def last_run(self) -> pd.DataFrame:
+        """
+        Records of last finished or current rerun in order of start
+
+        Returns:
+            records (pd.DataFrame) : Records of stages
+        """
+        records = sorted((record for record in self.records if record["run"] == self.run), key=lambda r: r["time"])
+        return pd.DataFrame(records, columns=["stage", "depth", "seconds", "cache", "bytes"])
+
+    def to_jsonl(self) -> str:
+        """All kept records as JSON lines"""
+        return to_jsonl(self.records)
+
+
+def current() -> Optional[Recorder]:
+    """Recorder of rerun running in current thread, None outside of pages (ingest.py, benchmarks)"""
+    return _recorder.get()
+
+
+@contextmanager
+def stage(name: str, cached: bool = False) -> Iterator[dict]:
+    """
+    Record wall time of block in current recorder, does nothing outside of pages
+
+    Parameters:
+        name (str) : Name of stage
+        cached (bool) : Stage is cached, it is recorded as hit unless cache_miss() is called inside
+    Returns:
+        record (dict) : Record of stage, "bytes" can be set inside block
+    """
+    recorder = current()
+    if recorder is None:
+        yield {}
+        return
+    with recorder.stage(name, cached) as record:
+        yield record
+
+
+def cache_miss() -> None:
+    """Mark innermost cached stage of current recorder as cache miss, call it inside body of cached function"""
+    recorder = current()
+    if recorder is not None:
+        recorder.cache_miss()
+
+
+def timed(name: str = None, cached: bool = False) -> Callable:
+    """
+    Decorator recording wall time and payload size of every call of function as stage.
+    Put it above st.cache_resource / st.cache_data with cached=True and call cache_miss() in function body
+    to record cache hits and misses, payload size is measured only on cache misses.
+
+    Parameters:
+        name (str) : Name of stage, name of function if None
+        cached (bool) : Function is cached
+    Returns:
+        decorator (Callable) : Decorator of function
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name or function.__name__, cached) as record:
+                result = function(*args, **kwargs)
+                # size of cached payload doesn't change between hits and measuring it is not free
+                if record and record["cache"] != "hit":
+                    record["bytes"] = payload_size(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def to_jsonl(records: Iterable[dict]) -> str:
+    """Serialize records to JSON lines"""
+    return "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+
+def write_jsonl(records: Iterable[dict], filename: str) -> None:
+    """
+    Append records to JSON lines file, safe for concurrent sessions of one process
+
+    Parameters:
+        records (Iterable[dict]) : Records of stages
+        filename (str) : Path of JSON lines file
+    """
+    lines = to_jsonl(records)
+    with _log_lock, open(filename, "a", encoding="utf-8") as file:
+        file.write(lines)
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from os.path import join
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from core.artifacts import fingerprint
+from core.dataset import partition_path, write_partition
+
+KAGGLE_DATASET = "krzysztofkulasik/daily-temperatures-of-lakes-poland"
+ARTIFACT_NAME = "lakes"
+PDF_DIR = "../lakes_streamlit/data/lakes/pdf"
+STORE_DIR = "../lakes_streamlit/data/lakes/parquet"
+MANIFEST_FILENAME = "manifest.json"
+SNAPSHOT_DIRNAME = "lakes"
+COLUMNS = ["Data", "Nazwa stacji", "Lokalizacja", "Województwo", "Temperatura wody"]
+SCHEMA = pa.schema([
+    ("Data", pa.date32()),
+    ("Nazwa stacji", pa.string()),
+    ("Lokalizacja", pa.string()),
+    ("Województwo", pa.dictionary(pa.int32(), pa.string())),
+    ("Temperatura wody", pa.float32())
+])
+INGEST_WORKERS = int(os.environ.get("LAKES_INGEST_WORKERS", os.cpu_count() or 1))
+
+logger = logging.getLogger(__name__)
+
+
+def export_date(filename) -> str:
+    """
+    Exporting date from filename
+    Parameters:
+        filename (str) : Filename of the pdf
+    Returns:
+        date (str) : Date in format "RRRR-MM-DD
+    """
+    pattern = r'([0-9]{8})'
+    matches = re.search(pattern, filename)
+    if matches.group(0) is not None:
+        match = matches.group(0)
+        date = f'{match[:4]}-{match[4:6]}-{match[6:8]}'
+        return date
+
+
+def find_pdfs(pdf_dir: str = PDF_DIR) -> Dict[str, str]:
+    """
+    Find daily pdf files in dataset directory
+
+    Parameters:
+        pdf_dir (str) : Directory with pdf files
+    Returns:
+        pdfs (Dict[str, str]) : Paths of pdf files by date of measurement
+    """
+    pdfs = {}
+    for root, _, files in os.walk(pdf_dir):
+        for filename in files:
+            if filename.endswith(".pdf"):
+                pdfs[export_date(filename)] = join(root, filename)
+    return pdfs
+
+
+def file_hash(filename: str) -> str:
+    """
+    Calculate sha256 hash of file content
+
+    Parameters:
+        filename (str) : Path of the file
+    Returns:
+        digest (str) : Hex digest of file content
+    """
+    sha = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def parse_pdf(filename: str, date: str) -> pd.DataFrame:
+    """
+    Parse table from single daily pdf file
+
+    Parameters:
+        filename (str) : Path of the pdf
+        date (str) : Date of measurement in format "RRRR-MM-DD"
+    Returns:
+        df_pdf (pd.DataFrame) : Table from pdf with all columns stored as strings
+    """
+    # tabula starts JVM, import it only when ingestion parses pdf files
+    import tabula
+
+    df_pdf = tabula.read_pdf(filename, lattice=True)[0]
+    df_pdf.dropna(axis=1, inplace=True)
+    df_pdf.drop(columns='Lp.', inplace=True)
+
+    df_pdf.rename(columns={'Temperatura wody\robserwator\r[°C]': 'Temperatura wody'}, inplace=True)
+    df_pdf['Data'] = date
+    return df_pdf.astype(str)
+
+
+def _parse_to_shard(job: Tuple[str, str, str]) -> Tuple[str, float]:
+    """Parse single pdf file and write its table to parquet shard, return time of parsing"""
+    filename, date, shard = job
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(shard), exist_ok=True)
+    parse_pdf(filename, date).to_parquet(f"{shard}.tmp", index=False)
+    os.replace(f"{shard}.tmp", shard)
+    return filename, time.perf_counter() - start
+
+
+def parse_pdfs(jobs: List[Tuple[str, str, str]], workers: int = INGEST_WORKERS) -> Dict[str, float]:
+    """
+    Parse pdf files to parquet shards using pool of worker processes.
+    With jpype installed every worker keeps single JVM running for all files it parses,
+    so JVM startup is paid once per worker instead of once per file.
+
+    Parameters:
+        jobs (List[Tuple[str, str, str]]) : Pdf filename, date of measurement and shard path for every file
+        workers (int) : Number of worker processes, files are parsed in current process if 1
+    Returns:
+        timings (Dict[str, float]) : Time of parsing in seconds by pdf filename
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        timings = dict(map(_parse_to_shard, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            timings = dict(pool.map(_parse_to_shard, jobs))
+
+    for filename, seconds in timings.items():
+        logger.info("Parsed %s in %.2f s", filename, seconds)
+    return timings
+
+
+def shard_path(store_dir: str, date: str) -> str:
+    """Path of parquet shard with table for given date, shards are partitioned by year and month of date"""
+    return join(partition_path(store_dir, int(date[:4]), int(date[5:7])), f"{date}.parquet")
+
+
+def read_manifest(store_dir: str = STORE_DIR) -> dict:
+    """
+    Read manifest of already parsed pdf files
+
+    Parameters:
+        store_dir (str) : Directory with parquet shards
+    Returns:
+        manifest (dict) : Entries (date, mtime, size, sha256, shard, parse_seconds) keyed by pdf filename
+    """
+    try:
+        with open(join(store_dir, MANIFEST_FILENAME), encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_manifest(manifest: dict, store_dir: str = STORE_DIR) -> None:
+    """Write manifest atomically, so readers never see half written file"""
+    manifest_filename = join(store_dir, MANIFEST_FILENAME)
+    with open(f"{manifest_filename}.tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, ensure_ascii=False)
+    os.replace(f"{manifest_filename}.tmp", manifest_filename)
+
+
+def update_store(pdf_dir: str = PDF_DIR, store_dir: str = STORE_DIR, workers: int = INGEST_WORKERS) -> Dict[str, str]:
+    """
+    Parse only new or changed pdf files to parquet shards, remove shards of deleted files.
+    File is considered unchanged when its mtime and size match the manifest, or when its content hash does.
+
+    Parameters:
+        pdf_dir (str) : Directory with pdf files
+        store_dir (str) : Directory with parquet shards and manifest
+        workers (int) : Number of worker processes used for parsing
+    Returns:
+        shards (Dict[str, str]) : Paths of parquet shards by date of measurement
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = read_manifest(store_dir)
+    pdfs = find_pdfs(pdf_dir)
+    updated = {}
+    jobs = []
+
+    for date, filename in pdfs.items():
+        key = os.path.relpath(filename, pdf_dir)
+        stat = os.stat(filename)
+        entry = manifest.get(key)
+        shard = shard_path(store_dir, date)
+
+        if entry is not None and entry["date"] == date and os.path.exists(shard):
+            if entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                updated[key] = entry
+                continue
+            digest = file_hash(filename)
+            if entry["sha256"] == digest:
+                updated[key] = dict(entry, mtime=stat.st_mtime, size=stat.st_size)
+                continue
+        else:
+            digest = file_hash(filename)
+
+        jobs.append((filename, date, shard))
+        updated[key] = {
+            "date": date,
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "sha256": digest,
+            "shard": os.path.relpath(shard, store_dir)
+        }
+
+    timings = parse_pdfs(jobs, workers)
+    for filename, _, _ in jobs:
+        updated[os.path.relpath(filename, pdf_dir)]["parse_seconds"] = round(timings[filename], 3)
+
+    live_shards = {entry["shard"] for entry in updated.values()}
+    for entry in manifest.values():
+        if entry["shard"] not in live_shards and os.path.exists(join(store_dir, entry["shard"])):
+            os.remove(join(store_dir, entry["shard"]))
+
+    if updated != manifest:
+        write_manifest(updated, store_dir)
+
+    return {entry["date"]: join(store_dir, entry["shard"]) for entry in updated.values()}
+
+
+def assemble_lakes(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate daily tables once, drop duplicated measurements once and assign types to columns.
+
+    Parameters:
+        frames (List[pd.DataFrame]) : Daily tables in order of dataset files, earlier measurement wins on duplicates
+    Returns:
+        data (pd.DataFrame) : DataFrame that contains concatenated daily tables
+    """
+    if not frames:
+        frames = [pd.DataFrame(columns=COLUMNS)]
+    data = pd.concat(frames, axis=0)
+    data = data[COLUMNS + [column for column in data.columns if column not in COLUMNS]]
+    data = data.drop_duplicates(subset=['Data', 'Nazwa stacji', 'Lokalizacja'], keep='first')
+
+    data = data.replace(
+        {
+            "Temperatura wody": "brak danych"
+        },
+        0
+    )
+    data = data.astype({
+        "Nazwa stacji": "string",
+        "Lokalizacja": "string",
+        "Województwo": "category",
+        "Temperatura wody": "float32"
+    })
+    data['Data'] = pd.to_datetime(data['Data']).dt.date
+    return data
+
+
+def load_store(shards: Dict[str, str]) -> pd.DataFrame:
+    """
+    Read parquet shards and assemble them to single DataFrame
+
+    Parameters:
+        shards (Dict[str, str]) : Paths of parquet shards by date of measurement
+    Returns:
+        data (pd.DataFrame) : DataFrame that contains concatenated daily tables
+    """
+    return assemble_lakes([pd.read_parquet(shard) for shard in shards.values()])
+
+
+def store_fingerprint(store_dir: str = STORE_DIR) -> str:
+    """
+    Calculate fingerprint of parsed pdf files, it changes only when file is added, changed or removed
+
+    Parameters:
+        store_dir (str) : Directory with parquet shards and manifest
+    Returns:
+        digest (str) : Fingerprint of store
+    """
+    return fingerprint([SNAPSHOT_DIRNAME,
+                        sorted((entry["date"], entry["sha256"]) for entry in read_manifest(store_dir).values())])
+
+
+def write_snapshot(shards: Dict[str, str], path: str) -> None:
+    """
+    Assemble parquet shards month by month and write them to Hive-style (year=/month=) parquet dataset,
+    so memory used by ingestion and by queries of the page is bounded by months they touch, not by all seasons
+
+    Parameters:
+        shards (Dict[str, str]) : Paths of parquet shards by date of measurement
+        path (str) : Root directory of dataset
+    """
+    os.makedirs(path, exist_ok=True)
+    months = defaultdict(dict)
+    for date, shard in sorted(shards.items()):
+        months[int(date[:4]), int(date[5:7])][date] = shard
+    for (year, month), month_shards in months.items():
+        write_partition(pa.Table.from_pandas(load_store(month_shards), schema=SCHEMA, preserve_index=False),
+                        path, year, month)
@@ -0,0 +1,295 @@
+import os
+import threading
+from typing import Callable, Hashable, List, Optional, Tuple
+
+import cachetools
+import numpy as np
+import pandas as pd
+from branca.element import MacroElement
+from jinja2 import Template
+
+TILE_SIZE = 256
+CLUSTER_CELL_SIZE = 80
+CLUSTER_MAX_ZOOM = 11
+BOUNDS_PADDING = 0.2
+LAYER_CACHE_SIZE = int(os.environ.get("MAP_LAYER_CACHE_SIZE", 64))
+CLUSTER_ICON_SIZE = 36
+CLUSTER_STYLE = ("background-color: rgba(49, 136, 204, 0.8); color: white; border-radius: 50%; "
+                 f"width: {CLUSTER_ICON_SIZE}px; height: {CLUSTER_ICON_SIZE}px; line-height: {CLUSTER_ICON_SIZE}px; "
+                 "text-align: center; font-weight: bold;")
+
+
+def bounds_corners(bounds: Optional[dict]) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Read corners of map viewport
+
+    Parameters:
+        bounds (Optional[dict]) : Bounds returned by st_folium ({"_southWest": {"lat", "lng"}, "_northEast": {...}})
+    Returns:
+        corners (Optional[Tuple[float, float, float, float]]) : South, west, north and east, None if bounds are unknown
+    """
+    try:
+        corners = (bounds["_southWest"]["lat"], bounds["_southWest"]["lng"],
+                   bounds["_northEast"]["lat"], bounds["_northEast"]["lng"])
+    except (KeyError, TypeError):
+        return None
+    return None if None in corners else corners
+
+
+def bounds_cover(rendered: Optional[dict], bounds: Optional[dict], padding: float = BOUNDS_PADDING) -> bool:
+    """
+    Check if viewport lies inside padded viewport markers were rendered for, so they don't have to be rendered again
+
+    Parameters:
+        rendered (Optional[dict]) : Bounds markers were rendered for, None if all markers of zoom level were rendered
+        bounds (Optional[dict]) : Current bounds of map
+        padding (float) : Fraction of rendered viewport size added on every side, the same as used by bounds_mask
+    Returns:
+        covered (bool) : True if all markers of current viewport were already rendered
+    """
+    outer, inner = bounds_corners(rendered), bounds_corners(bounds)
+    if outer is None:
+        return True
+    if inner is None:
+        return False
+    south, west, north, east = outer
+    lat_padding = (north - south) * padding
+    lon_padding = (east - west) * padding
+    return (inner[0] >= south - lat_padding and inner[1] >= west - lon_padding and
+            inner[2] <= north + lat_padding and inner[3] <= east + lon_padding)
+
+
+def bounds_mask(lat: np.ndarray, lon: np.ndarray, bounds: Optional[dict],
+                padding: float = BOUNDS_PADDING) -> np.ndarray:
+    """
+    Check which points lie inside map viewport
+
+    Parameters:
+        lat (np.ndarray) : Latitudes of points
+        lon (np.ndarray) : Longitudes of points
+        bounds (Optional[dict]) : Bounds returned by st_folium ({"_southWest": {"lat", "lng"}, "_northEast": {...}})
+        padding (float) : Fraction of viewport size added on every side, so small pans don't uncover empty map
+    Returns:
+        mask (np.ndarray) : Boolean mask of points inside padded viewport, all True if bounds are unknown
+    """
+    corners = bounds_corners(bounds)
+    if corners is None:
+        return np.ones(len(lat), dtype=bool)
+    south, west, north, east = corners
+
+    lat_padding = (north - south) * padding
+    lon_padding = (east - west) * padding
+    return ((lat >= south - lat_padding) & (lat <= north + lat_padding) &
+            (lon >= west - lon_padding) & (lon <= east + lon_padding))
+
+
+class ClusterPyramid:
+    """
+    Grid clusters of points precomputed for every zoom level below CLUSTER_MAX_ZOOM.
+    Points are bucketed into square lat/lon cells of about CLUSTER_CELL_SIZE screen pixels at given zoom,
+    every cell with more than one point is rendered as single cluster marker placed at centroid of its points.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, max_zoom: int = CLUSTER_MAX_ZOOM):
+        """
+        Parameters:
+            lat (np.ndarray) : Latitudes of points
+            lon (np.ndarray) : Longitudes of points
+            max_zoom (int) : Zoom level from which every point is rendered separately
+        """
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.max_zoom = max_zoom
+        self.levels = {zoom: self._cluster(zoom) for zoom in range(max_zoom)}
+
+    def _cluster(self, zoom: int) -> pd.DataFrame:
+        """
+        Bucket points into grid cells for given zoom level
+
+        Parameters:
+            zoom (int) : Zoom level
+        Returns:
+            clusters (pd.DataFrame) : Centroid (lat, lon), number of points (count) and position of first point (row)
+                of every non empty cell
+        """
+        cell = CLUSTER_CELL_SIZE * 360 / (TILE_SIZE * 2 ** zoom)
+        keys = np.floor((self.lat + 90) / cell).astype(np.int64) * (2 ** 32) + \
+            np.floor((self.lon + 180) / cell).astype(np.int64)
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        first = np.empty(len(counts), dtype=np.int64)
+        first[inverse[::-1]] = np.arange(len(keys))[::-1]
+        return pd.DataFrame({
+            "lat": np.bincount(inverse, weights=self.lat) / counts,
+            "lon": np.bincount(inverse, weights=self.lon) / counts,
+            "count": counts,
+            "row": first
+        })
+
+    def view(self, zoom: int, bounds: Optional[dict]) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Find clusters and single points to render for given zoom level and viewport
+
+        Parameters:
+            zoom (int) : Current zoom level of map
+            bounds (Optional[dict]) : Current bounds of map returned by st_folium, None for whole selection
+        Returns:
+            clusters (pd.DataFrame) : Clusters with more than one point inside viewport
+            rows (np.ndarray) : Positions of single points inside viewport
+        """
+        if zoom >= self.max_zoom:
+            rows = np.flatnonzero(bounds_mask(self.lat, self.lon, bounds))
+            return self.levels[0].iloc[:0], rows
+
+        level = self.levels[max(int(zoom), 0)]
+        visible = bounds_mask(level["lat"].to_numpy(), level["lon"].to_numpy(), bounds)
+        single = level["count"].to_numpy() == 1
+        return level[visible & ~single], level.loc[visible & single, "row"].to_numpy()
+
+
+def point_features(lat: np.ndarray, lon: np.ndarray, properties: pd.DataFrame) -> List[dict]:
+    """
+    Serialize points to GeoJSON features
+
+    Parameters:
+        lat (np.ndarray) : Latitudes of points
+        lon (np.ndarray) : Longitudes of points
+        properties (pd.DataFrame) : Properties of points, one row per point
+    Returns:
+        features (List[dict]) : GeoJSON Point features
+    """
+    return [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [point_lon, point_lat]},
+            "properties": point_properties
+        }
+        for point_lat, point_lon, point_properties in zip(np.asarray(lat).tolist(), np.asarray(lon).tolist(),
+                                                          properties.to_dict("records"))
+    ]
+
+
+class SelectionLayer:
+    """
+    Serialized map layer of single filter selection: GeoJSON features of all selected points
+    and their cluster pyramid. Read-only after creation, so single instance can be shared by all sessions.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, properties: pd.DataFrame):
+        """
+        Parameters:
+            lat (np.ndarray) : Latitudes of points
+            lon (np.ndarray) : Longitudes of points
+            properties (pd.DataFrame) : Properties of points, one row per point
+        """
+        self.features = point_features(lat, lon, properties)
+        self.pyramid = ClusterPyramid(lat, lon)
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        """Mean position of selected points, (0, 0) for empty selection"""
+        if not self.features:
+            return 0.0, 0.0
+        return self.pyramid.lat.mean().item(), self.pyramid.lon.mean().item()
+
+    def view(self, zoom: int, bounds: Optional[dict]) -> dict:
+        """
+        Build GeoJSON FeatureCollection of clusters and single points to render for given zoom level and viewport
+
+        Parameters:
+            zoom (int) : Current zoom level of map
+            bounds (Optional[dict]) : Current bounds of map returned by st_folium, None for whole selection
+        Returns:
+            collection (dict) : FeatureCollection, clusters have only "count" property,
+                single points have properties of the selection
+        """
+        clusters, rows = self.pyramid.view(zoom, bounds)
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"count": count}
+            }
+            for lat, lon, count in zip(clusters["lat"].tolist(), clusters["lon"].tolist(), clusters["count"].tolist())
+        ]
+        features.extend(self.features[row] for row in rows.tolist())
+        return {"type": "FeatureCollection", "features": features}
+
+
+class LayerCache:
+    """
+    Bounded LRU cache of selection layers shared by all sessions (st.cache_resource),
+    repeated selection skips querying data and serializing its points
+    """
+
+    def __init__(self, maxsize: int = LAYER_CACHE_SIZE):
+        """
+        Parameters:
+            maxsize (int) : Number of selections kept in cache, least recently used is evicted first
+        """
+        self._layers = cachetools.LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], SelectionLayer]) -> SelectionLayer:
+        """
+        Get layer of selection, build and store it on miss
+
+        Parameters:
+            key (Hashable) : Filter selection
+            build (Callable[[], SelectionLayer]) : Function building layer of selection
+        Returns:
+            layer (SelectionLayer) : Layer of selection
+        """
+        with self._lock:
+            layer = self._layers.get(key)
+            if layer is not None:
+                return layer
+        # Built outside of lock, so slow selection doesn't block other sessions
+        layer = build()
+        with self._lock:
+            self._layers[key] = layer
+        return layer
+
+
+class GeoJsonMarkers(MacroElement):
+    """
+    Single Leaflet GeoJSON layer with markers of points and clusters from SelectionLayer.view.
+    Markers, tooltips and popups are created in browser from feature properties, so page carries
+    one JSON array instead of separate JS snippet for every marker.
+    Tooltip is bound to every marker as plain string, so st_folium returns it as last_object_clicked_tooltip.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.geoJson({{ this.data|tojson }}, {
+            pointToLayer: function (feature, latlng) {
+                var p = feature.properties;
+                if (p.count !== undefined) {
+                    return L.marker(latlng, {icon: L.divIcon({
+                        html: `<div style="{{ this.cluster_style }}">${p.count}</div>`,
+                        className: "empty",
+                        iconSize: [{{ this.icon_size }}, {{ this.icon_size }}],
+                        iconAnchor: [{{ this.icon_size // 2 }}, {{ this.icon_size // 2 }}]
+                    })});
+                }
+                return L.marker(latlng)
+                    .bindTooltip(`{{ this.tooltip }}`, {sticky: true})
+                    .bindPopup(function () { return `{{ this.popup }}`; });
+            }
+        }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data: dict, tooltip: str, popup: str):
+        """
+        Parameters:
+            data (dict) : GeoJSON FeatureCollection returned by SelectionLayer.view
+            tooltip (str) : JS template literal of tooltip, properties of feature are available as p
+            popup (str) : JS template literal of popup, properties of feature are available as p
+        """
+        super().__init__()
+        self._name = "GeoJsonMarkers"
+        self.data = data
+        self.tooltip = tooltip
+        self.popup = popup
+        self.cluster_style = CLUSTER_STYLE
+        self.icon_size = CLUSTER_ICON_SIZE
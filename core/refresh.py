@@ -0,0 +1,139 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from core import artifacts
+
+REFRESH_INTERVAL = float(os.environ.get("REFRESH_INTERVAL", 3600))
+RETRY_INTERVAL = float(os.environ.get("REFRESH_RETRY_INTERVAL", 60))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_refresher = None
+
+
+class BackgroundRefresher(threading.Thread):
+    """
+    Daemon thread rebuilding datasets every interval seconds off the request path.
+    Sessions keep reading version of artifacts returned by path() while new one is built. After new version
+    is published, listeners subscribed to dataset load it into caches of pages, only then path() returns it,
+    so no session waits for loading of new version. While any dataset is not built yet (failed ingestion
+    on start), refresh is retried every RETRY_INTERVAL seconds.
+    """
+
+    def __init__(self, function: Callable[[], Optional[Dict[str, Optional[str]]]],
+                 current: Callable[[], Dict[str, Optional[str]]], interval: float = REFRESH_INTERVAL):
+        """
+        Parameters:
+            function (Callable[[], Optional[Dict[str, Optional[str]]]]) : Builds datasets, returns path of current
+                artifact by dataset (None if dataset is not built) or None if refresh was skipped
+            current (Callable[[], Dict[str, Optional[str]]]) : Finds path of current artifact by dataset
+            interval (float) : Seconds between refreshes
+        """
+        super().__init__(name="background-refresh", daemon=True)
+        self.function = function
+        self.current = current
+        self.interval = interval
+        self.paths: Dict[str, str] = {name: path for name, path in current().items() if path is not None}
+        self.status = {"started": None, "finished": None, "skipped": None, "error": None}
+        self._listeners: Dict[str, List[Callable[[str], None]]] = {}
+
+    def subscribe(self, name: str, callback: Callable[[str], None]) -> None:
+        """
+        Call callback with path of new version of dataset after refresh published it
+
+        Parameters:
+            name (str) : Name of dataset returned by function
+            callback (Callable[[str], None]) : Loads artifact at given path, e.g. calls cached loaders of page
+        """
+        self._listeners.setdefault(name, []).append(callback)
+
+    def path(self, name: str, artifact_name: str) -> str:
+        """
+        Find path of version of dataset which sessions should read
+
+        Parameters:
+            name (str) : Name of dataset
+            artifact_name (str) : Name of artifact of dataset
+        Returns:
+            path (str) : Path of last version warmed by refresher, current version if refresher doesn't run
+        """
+        if self.is_alive() and name in self.paths:
+            return self.paths[name]
+        return artifacts.current_path(artifact_name)
+
+    def complete(self) -> bool:
+        """All datasets are built"""
+        return None not in self.current().values()
+
+    def run(self) -> None:
+        delay = self.interval if self.complete() else 0
+        while True:
+            time.sleep(delay)
+            self.refresh()
+            delay = self.interval if self.complete() else min(self.interval, RETRY_INTERVAL)
+
+    def refresh(self) -> None:
+        """Rebuild datasets and warm caches of new versions, exceptions are logged, current versions stay in use"""
+        self.status["started"] = _now()
+        try:
+            paths = self.function()
+        except Exception as error:
+            self.status["error"] = f"{_now()}: {error!r}"
+            logger.exception("Refresh failed, current versions of datasets are kept")
+            return
+        finally:
+            self.status["finished"] = _now()
+        if paths is None:
+            self.status["skipped"] = _now()
+            logger.info("Refresh skipped, datasets are being built by other process")
+            return
+
+        self.status["error"] = None
+        for name, path in paths.items():
+            if path is None or self.paths.get(name) == path:
+                continue
+            for callback in self._listeners.get(name, []):
+                try:
+                    callback(path)
+                except Exception:
+                    logger.exception("Warming caches of %s failed", name)
+            # sessions switch to new version once it is loaded
+            self.paths[name] = path
+
+
+def _now() -> str:
+    """Current UTC time for status of refresher"""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def start(function: Callable[[], Optional[Dict[str, Optional[str]]]], current: Callable[[], Dict[str, Optional[str]]],
+          interval: float = REFRESH_INTERVAL) -> BackgroundRefresher:
+    """
+    Start background refresh once per process, later calls return running refresher
+
+    Parameters:
+        function (Callable[[], Optional[Dict[str, Optional[str]]]]) : Builds datasets, returns path of current
+            artifact by dataset (None if dataset is not built) or None if refresh was skipped
+        current (Callable[[], Dict[str, Optional[str]]]) : Finds path of current artifact by dataset
+        interval (float) : Seconds between refreshes, 0 disables refresh
+    Returns:
+        refresher (BackgroundRefresher) : Refresher of process
+    """
+    global _refresher
+    with _lock:
+        if _refresher is None:
+            _refresher = BackgroundRefresher(function, current, interval)
+            if interval > 0:
+                _refresher.start()
+        return _refresher
+
+
+def current() -> Optional[BackgroundRefresher]:
+    """Refresher of process, None if it wasn't started"""
+    return _refresher
+
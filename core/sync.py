@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import shutil
+import zipfile
+from os.path import join
+from typing import Dict, List, NamedTuple
+
+SYNC_STATE_FILENAME = ".sync.json"
+
+logger = logging.getLogger(__name__)
+
+
+class KaggleClient:
+    """
+    Files of kaggle datasets, one request for list of files and one request for every downloaded file.
+    Interrupted download of file is resumed by kaggle API on next call from size of file already on disk,
+    so sync_dataset removes local file before downloading new version of it.
+    """
+
+    def __init__(self):
+        # kaggle authenticates on import, so credentials are needed only when client is created
+        import kaggle
+
+        self.api = kaggle.api
+
+    def list_files(self, dataset: str) -> Dict[str, dict]:
+        """
+        List files of current version of dataset
+
+        Parameters:
+            dataset (str) : Kaggle dataset in format "owner/name"
+        Returns:
+            files (Dict[str, dict]) : Size and creation date by file name
+        """
+        result = self.api.dataset_list_files(dataset)
+        if result.error_message:
+            raise RuntimeError(result.error_message)
+        return {file.name: {"size": file.totalBytes, "created": str(file.creationDate)} for file in result.files}
+
+    def download_file(self, dataset: str, name: str, path: str) -> None:
+        """
+        Download single file of dataset
+
+        Parameters:
+            dataset (str) : Kaggle dataset in format "owner/name"
+            name (str) : Name of file in dataset
+            path (str) : Path of downloaded file
+        """
+        directory = os.path.dirname(path) or "."
+        self.api.dataset_download_file(dataset, name, path=directory, force=False, quiet=True)
+        # Large files are served zipped
+        zipped = f"{path}.zip"
+        if os.path.exists(zipped):
+            with zipfile.ZipFile(zipped) as archive:
+                archive.extractall(directory)
+            os.remove(zipped)
+
+
+class LocalClient:
+    """
+    Stand-in for KaggleClient serving datasets from local directory (<root>/<owner>/<name>/<files>),
+    used to run sync offline, in benchmarks and in development
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def list_files(self, dataset: str) -> Dict[str, dict]:
+        """
+        List files of dataset
+
+        Parameters:
+            dataset (str) : Dataset in format "owner/name"
+        Returns:
+            files (Dict[str, dict]) : Size and modification date by file name
+        """
+        dataset_dir = join(self.root, dataset)
+        files = {}
+        for root, _, filenames in os.walk(dataset_dir):
+            for filename in filenames:
+                stat = os.stat(join(root, filename))
+                name = os.path.relpath(join(root, filename), dataset_dir).replace(os.sep, "/")
+                files[name] = {"size": stat.st_size, "created": str(stat.st_mtime)}
+        return files
+
+    def download_file(self, dataset: str, name: str, path: str) -> None:
+        """
+        Copy single file of dataset, partially copied file is resumed from its current size
+
+        Parameters:
+            dataset (str) : Dataset in format "owner/name"
+            name (str) : Name of file in dataset
+            path (str) : Path of downloaded file
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        partial = f"{path}.part"
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        with open(join(self.root, dataset, name), "rb") as source, open(partial, "ab") as target:
+            source.seek(offset)
+            shutil.copyfileobj(source, target)
+        os.replace(partial, path)
+
+
+class SyncResult(NamedTuple):
+    changed: List[str]
+    removed: List[str]
+
+
+def read_state(path: str) -> dict:
+    """
+    Read state of last sync of dataset directory
+
+    Parameters:
+        path (str) : Directory of dataset
+    Returns:
+        state (dict) : Remote metadata of every downloaded file by file name
+    """
+    try:
+        with open(join(path, SYNC_STATE_FILENAME), encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_state(state: dict, path: str) -> None:
+    """Write state of sync atomically, so interrupted sync never loses already downloaded files"""
+    state_filename = join(path, SYNC_STATE_FILENAME)
+    with open(f"{state_filename}.tmp", "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2, ensure_ascii=False)
+    os.replace(f"{state_filename}.tmp", state_filename)
+
+
+def remove_download(filename: str) -> None:
+    """Remove downloaded file with its partial (LocalClient) and zipped (KaggleClient) downloads"""
+    for name in [filename, f"{filename}.part", f"{filename}.zip"]:
+        if os.path.exists(name):
+            os.remove(name)
+
+
+def sync_dataset(dataset: str, path: str, client) -> SyncResult:
+    """
+    Download only new or changed files of dataset and remove files deleted from it.
+    Metadata of remote files are compared with state of last sync, state is updated after every downloaded file,
+    so interrupted sync continues with remaining files. Download is marked as pending in state before it starts,
+    only pending download of the same version is resumed, other local files are removed and downloaded again.
+
+    Parameters:
+        dataset (str) : Dataset in format "owner/name"
+        path (str) : Directory of dataset
+        client (KaggleClient | LocalClient) : Source of dataset files
+    Returns:
+        result (SyncResult) : Paths of downloaded and removed files
+    """
+    os.makedirs(path, exist_ok=True)
+    state = read_state(path)
+    remote = client.list_files(dataset)
+    changed = []
+
+    for name, metadata in remote.items():
+        filename = join(path, name)
+        if state.get(name) == metadata and os.path.exists(filename):
+            continue
+        pending = {"pending": metadata}
+        if state.get(name) != pending:
+            # client resumes from size of local file, it must not append new version to previous one
+            remove_download(filename)
+            state[name] = pending
+            write_state(state, path)
+        client.download_file(dataset, name, filename)
+        state[name] = metadata
+        write_state(state, path)
+        changed.append(filename)
+
+    removed = []
+    for name in [name for name in state if name not in remote]:
+        filename = join(path, name)
+        remove_download(filename)
+        del state[name]
+        removed.append(filename)
+    if removed:
+        write_state(state, path)
+
+    logger.info("%s: %d files changed, %d removed", dataset, len(changed), len(removed))
+    return SyncResult(changed, removed)
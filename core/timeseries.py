@@ -0,0 +1,178 @@
+import functools
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAX_CHART_POINTS = 200
+ROLLUP_FREQUENCIES = {"W": "tygodniowa", "M": "miesięczna"}
+
+
+class SortedSeries:
+    """
+    Rows of table sorted by series key and date, with slice of every series,
+    so rows of series in date range are found by binary search in O(log n + k)
+    """
+
+    def __init__(self, data: pd.DataFrame, key: str, date_column: str):
+        """
+        Parameters:
+            data (pd.DataFrame) : Rows of all series
+            key (str) : Column with name of series
+            date_column (str) : Column with date of row
+        """
+        self.key = key
+        self.date_column = date_column
+        self.data = data.sort_values([key, date_column], kind="mergesort").reset_index(drop=True)
+        self.dates = pd.to_datetime(self.data[date_column]).to_numpy(dtype="datetime64[D]")
+
+        keys = self.data[key].to_numpy()
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=np.int64)
+        stops = np.r_[starts[1:], len(keys)]
+        self.slices: Dict[str, Tuple[int, int]] = {
+            keys[start]: (start, stop) for start, stop in zip(starts.tolist(), stops.tolist())
+        }
+
+    def positions(self, keys: List[str], start: date, end: date) -> np.ndarray:
+        """
+        Find positions of rows of series in inclusive date range
+
+        Parameters:
+            keys (List[str]) : Names of series
+            start (date) : First date of range
+            end (date) : Last date of range
+        Returns:
+            positions (np.ndarray) : Positions of rows, grouped by series and sorted by date
+        """
+        start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+        ranges = []
+        for key in keys:
+            first, last = self.slices.get(key, (0, 0))
+            dates = self.dates[first:last]
+            ranges.append(np.arange(first + np.searchsorted(dates, start, side="left"),
+                                    first + np.searchsorted(dates, end, side="right")))
+        return np.concatenate(ranges) if ranges else np.array([], dtype=np.int64)
+
+    def range(self, keys: List[str], start: date, end: date) -> pd.DataFrame:
+        """
+        Select rows of series in inclusive date range
+
+        Parameters:
+            keys (List[str]) : Names of series
+            start (date) : First date of range
+            end (date) : Last date of range
+        Returns:
+            data (pd.DataFrame) : Selected rows sorted by date
+        """
+        selected = self.data.iloc[self.positions(keys, start, end)]
+        return selected.sort_values(self.date_column, kind="mergesort").reset_index(drop=True)
+
+
+class TimeSeriesStore:
+    """
+    Daily measurements of every station with precomputed weekly and monthly rollups (min, mean, max).
+    Chart of long date range is plotted from the finest rollup with at most MAX_CHART_POINTS points per station.
+    """
+
+    def __init__(self, data: pd.DataFrame, key: str = "Nazwa stacji", date_column: str = "Data",
+                 value: str = "Temperatura wody"):
+        """
+        Parameters:
+            data (pd.DataFrame) : Daily measurements of all stations
+            key (str) : Column with name of station
+            date_column (str) : Column with date of measurement
+            value (str) : Column with measured value
+        """
+        self.key = key
+        self.date_column = date_column
+        self.value = value
+        self.daily = SortedSeries(data, key, date_column)
+        self.rollups = {frequency: SortedSeries(self._rollup(frequency), key, date_column)
+                        for frequency in ROLLUP_FREQUENCIES}
+
+    @functools.cached_property
+    def nbytes(self) -> int:
+        """Memory taken by daily measurements and rollups, measured once as store is read-only"""
+        return int(sum(series.data.memory_usage(deep=True).sum() for series in [self.daily, *self.rollups.values()]))
+
+    def _rollup(self, frequency: str) -> pd.DataFrame:
+        """
+        Aggregate daily measurements of every station to periods
+
+        Parameters:
+            frequency (str) : Pandas period frequency
+        Returns:
+            rollup (pd.DataFrame) : Minimum, mean (as value column) and maximum of every station and period,
+                date column holds first day of period
+        """
+        data = self.daily.data
+        periods = pd.to_datetime(data[self.date_column]).dt.to_period(frequency).dt.start_time.dt.date
+        rollup = data.groupby([data[self.key], periods.rename(self.date_column)], observed=True)[self.value] \
+            .agg(["min", "mean", "max"]).reset_index()
+        return rollup.rename(columns={"mean": self.value, "min": "Minimum", "max": "Maksimum"})
+
+    def unique(self, column: str, filters: Dict[str, List] = None) -> list:
+        """
+        Find unique values of column for measurements matching filters
+
+        Parameters:
+            column (str) : Column name
+            filters (Dict[str, List]) : Allowed values by column name
+        Returns:
+            values (list) : Unique values in order of first occurrence
+        """
+        data = self.daily.data
+        for name, values in (filters or {}).items():
+            data = data[data[name].isin(values)]
+        return data[column].dropna().unique().tolist()
+
+    def date_bounds(self, keys: List[str]) -> Tuple[date, date]:
+        """
+        Find first and last date of measurement of stations
+
+        Parameters:
+            keys (List[str]) : Names of stations
+        Returns:
+            bounds (Tuple[date, date]) : First and last date, None if stations have no measurements
+        """
+        slices = [self.daily.slices[key] for key in keys if key in self.daily.slices]
+        if not slices:
+            return None, None
+        first = min(self.daily.dates[start] for start, _ in slices)
+        last = max(self.daily.dates[stop - 1] for _, stop in slices)
+        return first.item(), last.item()
+
+    def range(self, keys: List[str], start: date, end: date) -> pd.DataFrame:
+        """
+        Select daily measurements of stations in inclusive date range
+
+        Parameters:
+            keys (List[str]) : Names of stations
+            start (date) : First date of range
+            end (date) : Last date of range
+        Returns:
+            data (pd.DataFrame) : Selected measurements sorted by date
+        """
+        return self.daily.range(keys, start, end)
+
+    def chart(self, keys: List[str], start: date, end: date,
+              max_points: int = MAX_CHART_POINTS) -> Tuple[str, pd.DataFrame]:
+        """
+        Select series to plot for stations in inclusive date range, daily measurements are replaced
+        by the finest rollup which has at most max_points points per station
+
+        Parameters:
+            keys (List[str]) : Names of stations
+            start (date) : First date of range
+            end (date) : Last date of range
+            max_points (int) : Maximum number of points per station
+        Returns:
+            frequency (str) : "D" for daily measurements, otherwise frequency of rollup
+            data (pd.DataFrame) : Series sorted by date
+        """
+        series = {"D": self.daily, **self.rollups}
+        for frequency, sorted_series in series.items():
+            positions = sorted_series.positions(keys, start, end)
+            if len(positions) <= max_points * max(len(keys), 1) or frequency == list(series)[-1]:
+                return frequency, sorted_series.range(keys, start, end)
@@ -0,0 +1,151 @@
+"""
+Sync datasets with kaggle and build ready-to-serve artifacts for both pages.
+Pages only memory-map current version of artifacts, so run this before starting the app
+(Docker container start, cron) and whenever datasets change. Only new or changed files are downloaded
+and processed again, unchanged datasets are not rebuilt.
+
+Usage:
+    python ingest.py                      # sync and build both datasets
+    python ingest.py --skip-download      # build from already downloaded files
+    python ingest.py --source DIR         # sync from local copy of datasets (DIR/<owner>/<name>/<files>)
+    python ingest.py --only lakes
+
+Running app also refreshes datasets every REFRESH_INTERVAL seconds (core/refresh.py) by running this script
+with --if-idle in subprocess, so refresh is skipped while other run of this script builds datasets.
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+from core import artifacts, bathing_water, lakes, sync
+
+logger = logging.getLogger("ingest")
+DATASETS = {"lakes": lakes.ARTIFACT_NAME, "bathing_water": bathing_water.ARTIFACT_NAME}
+SKIPPED_EXIT_CODE = 75
+
+
+def ingest_lakes(client, workers: int) -> str:
+    """
+    Sync pdf files, parse new or changed ones and publish new version of lakes artifact if anything changed
+
+    Parameters:
+        client (sync.KaggleClient | sync.LocalClient) : Source of dataset files, None to use downloaded files
+        workers (int) : Number of worker processes used for parsing
+    Returns:
+        path (str) : Path of current lakes artifact
+    """
+    if client is not None:
+        sync.sync_dataset(lakes.KAGGLE_DATASET, lakes.PDF_DIR, client)
+    shards = lakes.update_store(lakes.PDF_DIR, lakes.STORE_DIR, workers)
+    return artifacts.publish(lakes.ARTIFACT_NAME, lakes.SNAPSHOT_DIRNAME, lakes.store_fingerprint(lakes.STORE_DIR),
+                             lambda path: lakes.write_snapshot(shards, path))
+
+
+def ingest_bathing_water(client, workers: int) -> str:
+    """
+    Sync .xlsx files, process new or changed ones and publish new version of bathing water artifact
+    if any file changed
+
+    Parameters:
+        client (sync.KaggleClient | sync.LocalClient) : Source of dataset files, None to use downloaded files
+        workers (int) : Number of worker processes used for processing
+    Returns:
+        path (str) : Path of current bathing water artifact
+    """
+    if client is not None:
+        sync.sync_dataset(bathing_water.KAGGLE_DATASET, bathing_water.DATA_DIR, client)
+    files = bathing_water.find_workbooks(bathing_water.DATA_DIR)
+    source_fingerprint = bathing_water.workbooks_fingerprint(files)
+
+    def write(path: str) -> None:
+        bathing_water.build_parquet(files, bathing_water.PARQUET_FILENAME, workers, data_dir=bathing_water.DATA_DIR)
+        bathing_water.write_arrow(bathing_water.PARQUET_FILENAME, path)
+        bathing_water.write_analytics(path)
+
+    return artifacts.publish(bathing_water.ARTIFACT_NAME, bathing_water.ARROW_FILENAME, source_fingerprint, write)
+
+
+def run(client, workers: int, only: str = None) -> None:
+    """
+    Sync and build datasets, caller should hold artifacts.ingest_lock()
+
+    Parameters:
+        client (sync.KaggleClient | sync.LocalClient) : Source of dataset files, None to use downloaded files
+        workers (int) : Number of worker processes
+        only (str) : Name of single dataset to build, all if None
+    """
+    steps = {"lakes": ingest_lakes, "bathing_water": ingest_bathing_water}
+    for name, step in steps.items():
+        if only is not None and only != name:
+            continue
+        start = time.perf_counter()
+        path = step(client, workers)
+        logger.info("%s: %s (%.1f s)", name, path, time.perf_counter() - start)
+
+
+def current_paths() -> Dict[str, Optional[str]]:
+    """
+    Find current artifacts of datasets
+
+    Returns:
+        paths (Dict[str, Optional[str]]) : Path of current artifact by name of dataset, None if it is not built yet
+    """
+    paths = {}
+    for name, artifact_name in DATASETS.items():
+        pointer = artifacts.current(artifact_name)
+        paths[name] = None if pointer is None else artifacts.artifact_path(artifact_name, pointer["version"],
+                                                                          pointer["filename"])
+    return paths
+
+
+def refresh() -> Optional[Dict[str, Optional[str]]]:
+    """
+    Sync both datasets with kaggle and build them in subprocess, used by background refresh of running app.
+    Parsing (JVM of tabula, openpyxl) runs outside of streamlit server, in REFRESH_WORKERS worker processes
+    (1 by default) to leave CPU for serving pages.
+
+    Returns:
+        paths (Optional[Dict[str, Optional[str]]]) : Path of current artifact by name of dataset (None if it is
+            not built yet), None if datasets are being built by other process
+    """
+    command = [sys.executable, os.path.abspath(__file__), "--if-idle",
+               "--workers", os.environ.get("REFRESH_WORKERS", "1")]
+    status = subprocess.run(command).returncode
+    if status == SKIPPED_EXIT_CODE:
+        return None
+    if status != 0:
+        raise RuntimeError(f"ingest.py exited with status {status}")
+    return current_paths()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=["lakes", "bathing_water"], help="build only one dataset")
+    parser.add_argument("--skip-download", action="store_true", help="don't download datasets from kaggle")
+    parser.add_argument("--source", help="sync from local copy of datasets instead of kaggle")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--if-idle", action="store_true",
+                        help=f"exit with status {SKIPPED_EXIT_CODE} if other process is building datasets")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    if args.skip_download:
+        client = None
+    elif args.source is not None:
+        client = sync.LocalClient(args.source)
+    else:
+        client = sync.KaggleClient()
+
+    with artifacts.ingest_lock(blocking=not args.if_idle) as acquired:
+        if not acquired:
+            logger.info("Datasets are being built by other process, skipped")
+            sys.exit(SKIPPED_EXIT_CODE)
+        run(client, args.workers, args.only)
+
+
+if __name__ == "__main__":
+    main()
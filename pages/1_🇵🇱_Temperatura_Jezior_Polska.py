@@ -1,101 +1,123 @@
-import pandas as pd
+from collections import deque
+from typing import Deque, Tuple
+
 import streamlit as st
-import plotly.express as px
-import os
-import re
-import tabula
-from os.path import join
-import kaggle
-
-
-@st.cache_resource(ttl=3600, show_spinner="Pobieranie danych")
-def download_dataset() -> None:
-    """Download dataset from kaggle """
-    kaggle.api.dataset_download_files(
-        dataset="krzysztofkulasik/daily-temperatures-of-lakes-poland",
-        path="../lakes_streamlit/data/lakes/pdf",
-        unzip=True
-    )
-    return
+import ingest
+from core import dataset, debug_panel, instrumentation, lakes, refresh, timeseries
 
+SERIES_CACHE_SIZE = 8
 
-def export_date(filename) -> str:
+
+@instrumentation.timed("load_lakes", cached=True)
+@st.cache_resource(max_entries=2, show_spinner="Wczytywanie danych")
+def load_lakes(path: str) -> dataset.PartitionedDataset:
     """
-    Exporting date from filename
+    Open current version of dataset built by ingest.py (renamed columns, assigned types to columns),
+    partitioned by year and month of measurement. Dataset is opened once and shared by all sessions,
+    previous version is kept until sessions switch to new one.
+
     Parameters:
-        filename (str) : Filename of the pdf
+        path (str) : Path of current version of dataset
     Returns:
-        date (str) : Date in format "RRRR-MM-DD
+        data (dataset.PartitionedDataset) : Dataset that contains concatenated files from dataset
     """
-    pattern = r'([0-9]{8})'
-    matches = re.search(pattern, filename)
-    if matches.group(0) is not None:
-        match = matches.group(0)
-        date = f'{match[:4]}-{match[4:6]}-{match[6:8]}'
-        return date
 
+    instrumentation.cache_miss()
+    return dataset.PartitionedDataset(path)
 
-@st.cache_data(ttl=3600, show_spinner="Przetwarzanie danych")
-def load_lakes() -> pd.DataFrame:
+
+@instrumentation.timed("load_series", cached=True)
+@st.cache_resource(max_entries=2 * SERIES_CACHE_SIZE, show_spinner="Przygotowywanie serii czasowych")
+def load_series(path: str, seasons: Tuple[int, ...]) -> timeseries.TimeSeriesStore:
     """
-    Load and process dataset (rename columns, assign types to columns).
+    Build time-series store of selected seasons, shared by all sessions.
+    Only partitions of selected seasons are read, measurements are sorted by station and date once,
+    weekly and monthly rollups are precomputed.
 
+    Parameters:
+        path (str) : Path of current version of dataset
+        seasons (Tuple[int, ...]) : Selected years
     Returns:
-        data (pd.DataFrame) : DataFrame that contains concatenated files from dataset
+        store (timeseries.TimeSeriesStore) : Measurements of every station sorted by date
     """
 
-    pdf_dir = "../lakes_streamlit/data/lakes/pdf"
-    pdfs = {}
-    for root, _, files in os.walk(pdf_dir):
-        for filename in files:
-            pdfs[export_date(filename)] = join(root, filename)
+    instrumentation.cache_miss()
+    return timeseries.TimeSeriesStore(load_lakes(path).query(filters={"year": list(seasons)}))
 
-    concat_pdfs = pd.DataFrame(columns=["Data", "Nazwa stacji", "Lokalizacja", "Województwo", "Temperatura wody"])
 
-    for date, filename in pdfs.items():
-        df_pdf = tabula.read_pdf(filename, lattice=True)[0]
-        df_pdf.dropna(axis=1, inplace=True)
-        df_pdf.drop(columns='Lp.', inplace=True)
+@st.cache_resource
+def requested_seasons() -> Deque[Tuple[int, ...]]:
+    """
+    Selections of seasons recently requested by sessions, their series are built for new version of dataset
+    before sessions switch to it
 
-        df_pdf.rename(columns={'Temperatura wody\robserwator\r[°C]': 'Temperatura wody'}, inplace=True)
-        df_pdf['Data'] = date
+    Returns:
+        seasons (Deque[Tuple[int, ...]]) : Selected years, newest last
+    """
+    return deque(maxlen=SERIES_CACHE_SIZE)
 
-        concat_pdfs = pd.concat([concat_pdfs, df_pdf], axis=0)
-        concat_pdfs.drop_duplicates(subset=['Data', 'Nazwa stacji', 'Lokalizacja'], keep='first', inplace=True)
 
-    data = concat_pdfs.replace(
-        {
-            "Temperatura wody": "brak danych"
-        },
-        0
-    )
-    data = data.astype({
-        "Data": "datetime64[ns]",
-        "Nazwa stacji": "string",
-        "Lokalizacja": "string",
-        "Województwo": "category",
-        "Temperatura wody": "float32"
-    })
-    data['Data'] = data['Data'].apply(lambda x: x.date())
-    return data
+def warm_caches(path: str) -> None:
+    """
+    Load new version of dataset and series of recently requested seasons (last season if none was requested yet)
+    into caches shared by sessions, called by background refresh when new version is published
+
+    Parameters:
+        path (str) : Path of new version of dataset
+    """
+    data = load_lakes(path)
+    for seasons in dict.fromkeys([tuple(data.seasons[-1:]), *requested_seasons()]):
+        if set(seasons) <= set(data.seasons):
+            load_series(path, seasons)
+
+
+@st.cache_resource
+def start_refresh() -> refresh.BackgroundRefresher:
+    """
+    Start background refresh of datasets once per process and subscribe caches of page to new versions
+
+    Returns:
+        refresher (refresh.BackgroundRefresher) : Refresher of process
+    """
+    refresher = refresh.start(ingest.refresh, ingest.current_paths)
+    refresher.subscribe("lakes", warm_caches)
+    return refresher
 
 
 st.set_page_config(page_title="Temperatura jezior w Polsce", layout="wide", page_icon="🇵🇱")
 st.title("Temperatura jezior w Polsce")
 
-with st.container():
-    download_dataset()
-    df = load_lakes()
+with debug_panel.recording("lakes"), st.container():
+    try:
+        path = start_refresh().path("lakes", lakes.ARTIFACT_NAME)
+        df = load_lakes(path)
+    except FileNotFoundError as error:
+        st.error(f"Dane nie są jeszcze przygotowane: {error}")
+        st.stop()
+    selected_season = st.multiselect(
+        label="Sezon",
+        placeholder="Wybierz sezon",
+        options=df.seasons,
+        default=df.seasons[-1:]
+    )
+    if len(selected_season) == 0:
+        st.info("Wybierz sezon")
+        st.stop()
+
+    seasons = tuple(sorted(selected_season))
+    if seasons not in requested_seasons():
+        requested_seasons().append(seasons)
+    series = load_series(path, seasons)
     selected_region = st.multiselect(
         label="Nazwa województwa",
         placeholder="Wybierz lub wpisz nazwę województwa",
-        options=df['Województwo'].unique()
+        options=series.unique("Województwo")
     )
     selected_lake = st.multiselect(
         label="Nazwa stacji",
         placeholder="Wybierz lub wpisz nazwę stacji",
-        options=df.loc[df["Województwo"].isin(selected_region), "Nazwa stacji"].unique() if len(selected_region) > 0
-        else df["Nazwa stacji"].unique(),
+        options=series.unique("Nazwa stacji", {"Województwo": selected_region}) if len(selected_region) > 0
+        else series.unique("Nazwa stacji"),
         max_selections=3
     )
 
@@ -103,16 +125,16 @@ with st.container():
         st.info("Wybierz województwo albo stację ")
 
     else:
-        dates = df.loc[df["Nazwa stacji"].isin(selected_lake), "Data"]
+        first_date, last_date = series.date_bounds(selected_lake)
 
         selected_date = st.date_input(
             "Podaj datę dla pomiaru temperatury",
             value=[
-                dates.min(),
-                dates.max()
+                first_date,
+                last_date
             ],
-            min_value=dates.min(),
-            max_value=dates.max(),
+            min_value=first_date,
+            max_value=last_date,
             format="YYYY-MM-DD"
         )
 
@@ -122,10 +144,10 @@ with st.container():
         else:
             start_date, end_date = selected_date
 
-            selected_data = df[(df['Data'] >= start_date) &
-                               (df['Data'] <= end_date) &
-                               (df['Nazwa stacji'].isin(selected_lake))
-                               ].sort_values(by="Data")
+            with instrumentation.stage("query series") as record:
+                selected_data = series.range(selected_lake, start_date, end_date)
+                frequency, chart_data = series.chart(selected_lake, start_date, end_date)
+                record["bytes"] = instrumentation.payload_size(selected_data)
 
             # To consider
             # st.subheader("Temperatura z ostatniego pomiaru:")
@@ -139,15 +161,26 @@ with st.container():
             #     stat.metric(label="Stacja", value=station)
             #     temp.metric(label="Temperatura", value=last_day_temp)
 
-            st.plotly_chart(
-                px.line(
-                    selected_data,
+            if frequency != "D":
+                st.caption(f"Zakres jest długi, wykres pokazuje średnią {timeseries.ROLLUP_FREQUENCIES[frequency]} "
+                           f"temperaturę (minimum i maksimum po najechaniu na punkt)")
+
+            with instrumentation.stage("plotly figure") as record:
+                # plotly is imported on first chart, not on every start of page
+                import plotly.express as px
+
+                figure = px.line(
+                    chart_data,
                     x="Data",
                     y="Temperatura wody",
                     color="Nazwa stacji",
+                    hover_data=["Minimum", "Maksimum"] if frequency != "D" else None,
                     markers=True
                 )
-            )
+                if debug_panel.enabled():
+                    record["bytes"] = len(figure.to_json())
+
+            st.plotly_chart(figure)
 
             st.dataframe(
                 selected_data
@@ -0,0 +1,91 @@
+import pandas as pd
+import streamlit as st
+import ingest
+from core import bathing_water, dataset, debug_panel, instrumentation, refresh
+
+QUALITY_COLORS = {"Excellent": "#1a9850", "Good": "#91cf60", "Sufficient": "#fee08b", "Poor": "#d73027",
+                  "Not classified": "#bdbdbd"}
+COMPARE_BY = {"Country": "country", "Zone type": "zoneType"}
+
+
+@instrumentation.timed("load_trends", cached=True)
+@st.cache_resource(max_entries=2, show_spinner="Loading data")
+def load_trends(path: str) -> pd.DataFrame:
+    """
+    Load counts of quality classes by country, zone type and year precomputed by ingest.py once per version
+    of dataset, shared by all sessions
+
+    Parameters:
+        path (str) : Path of current version of dataset
+    Returns:
+        trends (pd.DataFrame) : DataFrame with country, zoneType, year, quality and count columns
+    """
+
+    instrumentation.cache_miss()
+    return dataset.ArrowDataset(bathing_water.analytics_path(path, bathing_water.TRENDS_FILENAME)).query()
+
+
+@st.cache_resource
+def start_refresh() -> refresh.BackgroundRefresher:
+    """
+    Start background refresh of datasets once per process and load new version of trends into cache
+    as soon as it is published
+
+    Returns:
+        refresher (refresh.BackgroundRefresher) : Refresher of process
+    """
+    refresher = refresh.start(ingest.refresh, ingest.current_paths)
+    refresher.subscribe("bathing_water", load_trends)
+    return refresher
+
+
+st.set_page_config(page_title="Bathing Water Quality Trends EU", layout="wide", page_icon="📈")
+st.title("Bathing Water Quality Trends for European Union 1990-2022")
+
+with debug_panel.recording("quality_trends"):
+    try:
+        trends = load_trends(start_refresh().path("bathing_water", bathing_water.ARTIFACT_NAME))
+    except FileNotFoundError as error:
+        st.error(f"Data is not prepared yet: {error}")
+        st.stop()
+
+    selected_country = st.multiselect(
+        label="Name of country",
+        placeholder="All countries",
+        options=trends["country"].cat.categories.tolist()
+    )
+    selected_zone_type = st.multiselect(
+        label="Zone type",
+        placeholder="All zone types",
+        options=trends["zoneType"].cat.categories.tolist()
+    )
+
+    with instrumentation.stage("quality shares") as record:
+        shares = bathing_water.quality_shares(trends, selected_country, selected_zone_type)
+        record["bytes"] = instrumentation.payload_size(shares)
+
+    # plotly is imported on first chart, not on every start of page
+    import plotly.express as px
+
+    st.subheader("Share of quality classes by year")
+    with instrumentation.stage("plotly figure"):
+        figure = px.bar(shares, x="year", y="share", color="quality", color_discrete_map=QUALITY_COLORS,
+                        hover_data=["count"], category_orders={"quality": list(QUALITY_COLORS)})
+        figure.update_layout(yaxis_tickformat=".0%", barmode="stack")
+    st.plotly_chart(figure, use_container_width=True)
+
+    st.subheader("Trend of quality class")
+    compare_col, class_col = st.columns(2)
+    compare_by = compare_col.radio("Compare by", options=list(COMPARE_BY), horizontal=True)
+    quality = class_col.selectbox("Quality class", options=list(QUALITY_COLORS))
+
+    with instrumentation.stage("quality shares") as record:
+        compared = bathing_water.quality_shares(trends, selected_country, selected_zone_type, by=COMPARE_BY[compare_by])
+        compared = compared[compared["quality"] == quality]
+        record["bytes"] = instrumentation.payload_size(compared)
+
+    with instrumentation.stage("plotly figure"):
+        figure = px.line(compared, x="year", y="share", color=COMPARE_BY[compare_by], hover_data=["count"],
+                         markers=True)
+        figure.update_layout(yaxis_tickformat=".0%")
+    st.plotly_chart(figure, use_container_width=True)
@@ -0,0 +1,18 @@
+import pandas as pd
+
+from benchmarks.bench_process_data import (legacy_find_monitoring_implementation_year,
+                                           legacy_find_start_of_quality_measurement)
+from benchmarks.synthetic import synthetic_bathing_waters
+from core import bathing_water
+
+
+def test_column_wise_years_match_row_wise_implementation():
+    data = bathing_water.process_data([synthetic_bathing_waters(2000)])
+
+    expected_start_of_quality = data.apply(legacy_find_start_of_quality_measurement, axis=1)
+    expected_implementation_year = data.apply(legacy_find_monitoring_implementation_year, axis=1)
+
+    pd.testing.assert_series_equal(bathing_water.find_start_of_quality_measurement(data).astype(object),
+                                   expected_start_of_quality.astype(object), check_names=False)
+    pd.testing.assert_series_equal(bathing_water.find_monitoring_implementation_year(data).astype(object),
+                                   expected_implementation_year.astype(object), check_names=False)
@@ -0,0 +1,10 @@
+import os
+
+import pytest
+
+from benchmarks.check_import_time import ROOT, import_profile, lazy_imports, page_scripts, top_level_imports
+
+
+@pytest.mark.parametrize("page", page_scripts(), ids=lambda page: os.path.relpath(page, ROOT))
+def test_page_start_does_not_load_lazy_dependencies(page):
+    assert lazy_imports(import_profile(top_level_imports(page))) == []
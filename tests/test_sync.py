@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+from core import sync
+
+DATASET = "owner/name"
+
+
+@pytest.fixture
+def source(tmp_path):
+    root = tmp_path / "source"
+    (root / DATASET / "2023").mkdir(parents=True)
+    return root
+
+
+@pytest.fixture
+def target(tmp_path):
+    return tmp_path / "target"
+
+
+def write_source(source, name: str, content: bytes, mtime: float = 1_000_000) -> None:
+    filename = source / DATASET / name
+    filename.write_bytes(content)
+    os.utime(filename, (mtime, mtime))
+
+
+def sync_dataset(source, target) -> sync.SyncResult:
+    return sync.sync_dataset(DATASET, str(target), sync.LocalClient(str(source)))
+
+
+def test_second_sync_downloads_nothing(source, target):
+    write_source(source, "a.xlsx", b"a")
+    write_source(source, "2023/b.pdf", b"b")
+
+    assert sorted(sync_dataset(source, target).changed) == [str(target / "2023/b.pdf"), str(target / "a.xlsx")]
+    assert sync_dataset(source, target) == sync.SyncResult([], [])
+
+
+def test_added_changed_and_removed_files(source, target):
+    write_source(source, "a.xlsx", b"a")
+    write_source(source, "b.xlsx", b"b")
+    sync_dataset(source, target)
+
+    write_source(source, "a.xlsx", b"changed", mtime=2_000_000)
+    write_source(source, "c.xlsx", b"c")
+    os.remove(source / DATASET / "b.xlsx")
+    result = sync_dataset(source, target)
+
+    assert sorted(result.changed) == [str(target / "a.xlsx"), str(target / "c.xlsx")]
+    assert result.removed == [str(target / "b.xlsx")]
+    assert (target / "a.xlsx").read_bytes() == b"changed"
+    assert sorted(os.listdir(target)) == [sync.SYNC_STATE_FILENAME, "a.xlsx", "c.xlsx"]
+
+
+def test_interrupted_copy_is_resumed(source, target):
+    write_source(source, "a.xlsx", b"0123456789")
+    metadata = sync.LocalClient(str(source)).list_files(DATASET)["a.xlsx"]
+    target.mkdir()
+    (target / sync.SYNC_STATE_FILENAME).write_text(json.dumps({"a.xlsx": {"pending": metadata}}))
+    # bytes of partial copy differ from source, so result shows they were kept
+    (target / "a.xlsx.part").write_bytes(b"abcd")
+
+    assert sync_dataset(source, target).changed == [str(target / "a.xlsx")]
+    assert (target / "a.xlsx").read_bytes() == b"abcd456789"
+    assert sync.read_state(str(target)) == {"a.xlsx": metadata}
+
+
+def test_changed_file_is_replaced_not_appended(source, target):
+    write_source(source, "a.xlsx", b"previous version")
+    sync_dataset(source, target)
+    # previous version was being downloaded again when sync was interrupted
+    state = sync.read_state(str(target))
+    (target / sync.SYNC_STATE_FILENAME).write_text(json.dumps({"a.xlsx": {"pending": state["a.xlsx"]}}))
+    (target / "a.xlsx.part").write_bytes(b"previous")
+
+    write_source(source, "a.xlsx", b"new", mtime=2_000_000)
+    sync_dataset(source, target)
+
+    assert (target / "a.xlsx").read_bytes() == b"new"
+    assert not (target / "a.xlsx.part").exists()